@@ -0,0 +1,114 @@
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from reviews.models import User
+from .cache import token_versions
+from .revocation import revocation_list
+
+USER_CLAIMS = User.claim_fields
+TOKEN_VERSION_CLAIM = 'ver'
+
+
+class UserClaimsMixin:
+    """Добавляет в токен роль пользователя и версию его токенов."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
+
+
+class UserClaimsAccessToken(UserClaimsMixin, AccessToken):
+    """Токен доступа с данными пользователя."""
+
+
+class UserClaimsRefreshToken(UserClaimsMixin, RefreshToken):
+    """Токен обновления с данными пользователя."""
+
+    access_token_class = UserClaimsAccessToken
+
+
+def check_token_version(token):
+    """
+    Проверяет, что версия токена совпадает с текущей версией
+    токенов пользователя, и возвращает ее.
+    """
+    version = token_versions.get(token.get(api_settings.USER_ID_CLAIM))
+    if version is None:
+        raise AuthenticationFailed(
+            'Пользователь не найден', code='user_not_found'
+        )
+    if version != token.get(TOKEN_VERSION_CLAIM):
+        raise AuthenticationFailed(
+            'Токен устарел, получите новый', code='token_not_valid'
+        )
+    return version
+
+
+def check_user_active(token):
+    """
+    Проверяет, что пользователь из токена активен.
+    В токенах без данных пользователя активность проверяется по базе.
+    """
+    if 'is_active' in token:
+        is_active = token['is_active']
+    else:
+        is_active = User.objects.filter(
+            pk=token.get(api_settings.USER_ID_CLAIM), is_active=True
+        ).exists()
+    if not is_active:
+        raise AuthenticationFailed(
+            'Пользователь неактивен', code='user_inactive'
+        )
+
+
+def check_token_revoked(token):
+    """Проверяет, что токен не отозван."""
+    if revocation_list.is_revoked(
+        token.get(api_settings.USER_ID_CLAIM), token.get('iat', 0)
+    ):
+        raise AuthenticationFailed('Токен отозван', code='token_revoked')
+
+
+class UserClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Аутентификация по JWT без запроса пользователя к базе данных.
+    Пользователь собирается из данных токена, остальные поля
+    догружаются из базы данных при первом обращении к ним.
+    Версия токена сверяется с версией токенов пользователя,
+    поэтому после изменения данных из токена, в том числе
+    деактивации, старые токены перестают действовать.
+    Токены без данных пользователя проверяются по базе данных.
+    Отозванные токены отклоняются в обоих случаях.
+    """
+
+    def get_user(self, validated_token):
+        check_token_revoked(validated_token)
+        claims = (TOKEN_VERSION_CLAIM, api_settings.USER_ID_CLAIM)
+        if any(
+            claim not in validated_token for claim in claims + USER_CLAIMS
+        ):
+            return super().get_user(validated_token)
+        check_user_active(validated_token)
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        version = check_token_version(validated_token)
+        values = {claim: validated_token[claim] for claim in USER_CLAIMS}
+        values.update({
+            api_settings.USER_ID_FIELD: user_id,
+            'token_version': version,
+        })
+        field_names = [
+            field.attname for field in User._meta.concrete_fields
+            if field.attname in values
+        ]
+        return User.from_db(
+            DEFAULT_DB_ALIAS,
+            field_names,
+            [values[name] for name in field_names],
+        )
@@ -0,0 +1,188 @@
+from hashlib import md5
+from math import ceil
+from threading import Lock
+from time import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils.http import quote_etag
+
+from reviews.models import CatalogVersion, User
+
+CATEGORIES_SCOPE = 'categories'
+GENRES_SCOPE = 'genres'
+TITLES_SCOPE = 'titles'
+TITLE_SCOPE = 'title:{}'
+
+
+class TitleDetailCache:
+    """Кэш сериализованных данных произведения со счетчиками обращений."""
+
+    key_template = 'title-detail:{}'
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+
+    def get_key(self, title_id):
+        """Возвращает ключ кэша для произведения."""
+        return self.key_template.format(title_id)
+
+    def get(self, title_id):
+        """Возвращает данные произведения из кэша или None."""
+        data = cache.get(self.get_key(title_id))
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+
+    def set(self, title_id, data):
+        """Сохраняет данные произведения в кэш."""
+        cache.set(
+            self.get_key(title_id), data, settings.TITLE_CACHE_TIMEOUT
+        )
+
+    def invalidate(self, title_ids):
+        """Удаляет данные произведений из кэша."""
+        cache.delete_many([self.get_key(pk) for pk in title_ids])
+
+    def stats(self):
+        """Возвращает количество попаданий и промахов кэша."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    def reset_stats(self):
+        """Обнуляет счетчики обращений."""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+class CatalogVersions:
+    """
+    Версии наборов данных каталога для условных GET-запросов.
+    Версией служит время последнего изменения набора, оно хранится
+    в таблице CatalogVersion. Кэш стоит перед таблицей и хранит версии
+    CATALOG_VERSION_CACHE_TIMEOUT секунд: с кэшем в памяти процесса
+    изменение, сделанное в другом процессе, становится видно
+    не позже, чем через это время. Если версии нет и в таблице,
+    она создается со временем первого обращения.
+    """
+
+    key_template = 'catalog-version:{}'
+
+    def get_key(self, scope):
+        """Возвращает ключ кэша для версии набора данных."""
+        return self.key_template.format(scope)
+
+    def get_many(self, scopes):
+        """Возвращает версии наборов данных."""
+        keys = {self.get_key(scope): scope for scope in scopes}
+        versions = {
+            keys[key]: version
+            for key, version in cache.get_many(keys).items()
+        }
+        missing = [scope for scope in scopes if scope not in versions]
+        if missing:
+            stored = self.read(missing)
+            if len(stored) < len(missing):
+                now = time()
+                CatalogVersion.objects.bulk_create(
+                    (
+                        CatalogVersion(scope=scope, version=now)
+                        for scope in missing if scope not in stored
+                    ),
+                    ignore_conflicts=True,
+                )
+                # Версию мог одновременно создать другой процесс.
+                stored = self.read(missing)
+            self.cache_many(stored)
+            versions.update(stored)
+        return versions
+
+    def read(self, scopes):
+        """Читает версии наборов данных из таблицы."""
+        return dict(
+            CatalogVersion.objects.filter(scope__in=scopes).values_list(
+                'scope', 'version'
+            )
+        )
+
+    def cache_many(self, versions):
+        """Сохраняет версии наборов данных в кэш."""
+        cache.set_many(
+            {
+                self.get_key(scope): version
+                for scope, version in versions.items()
+            },
+            timeout=settings.CATALOG_VERSION_CACHE_TIMEOUT,
+        )
+
+    def bump(self, scopes):
+        """Отмечает наборы данных как измененные."""
+        now = time()
+        CatalogVersion.objects.bulk_create(
+            (CatalogVersion(scope=scope, version=now) for scope in scopes),
+            ignore_conflicts=True,
+        )
+        CatalogVersion.objects.filter(scope__in=scopes).update(version=now)
+        self.cache_many({scope: now for scope in scopes})
+
+    def get_validators(self, scopes, representation):
+        """
+        Возвращает ETag и Last-Modified (timestamp) представления,
+        зависящего от наборов данных scopes.
+        """
+        versions = self.get_many(scopes)
+        digest = md5(
+            f'{representation}:{sorted(versions.items())}'.encode()
+        ).hexdigest()
+        return quote_etag(digest), ceil(max(versions.values()))
+
+
+class TokenVersions:
+    """
+    Версии токенов пользователей.
+    Токены с устаревшей версией отклоняются. Версия читается из кэша,
+    а при его отсутствии из базы данных.
+    """
+
+    key_template = 'token-version:{}'
+
+    def get_key(self, user_id):
+        """Возвращает ключ кэша для версии токенов пользователя."""
+        return self.key_template.format(user_id)
+
+    def get(self, user_id):
+        """Возвращает версию токенов пользователя или None, если его нет."""
+        key = self.get_key(user_id)
+        version = cache.get(key)
+        if version is None:
+            version = User.objects.filter(pk=user_id).values_list(
+                'token_version', flat=True
+            ).first()
+            if version is not None:
+                cache.set(key, version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+        return version
+
+    def bump(self, user_id):
+        """Отзывает выданные пользователю токены."""
+        User.objects.filter(pk=user_id).update(
+            token_version=F('token_version') + 1
+        )
+        self.invalidate(user_id)
+
+    def invalidate(self, user_id):
+        """Удаляет версию токенов из кэша после фиксации транзакции."""
+        key = self.get_key(user_id)
+        transaction.on_commit(lambda: cache.delete(key))
+
+
+title_cache = TitleDetailCache()
+catalog_versions = CatalogVersions()
+token_versions = TokenVersions()
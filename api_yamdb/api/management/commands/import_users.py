@@ -0,0 +1,40 @@
+import json
+
+from django.core.management import BaseCommand, CommandError
+
+from api.provisioning import USERS_CHUNK_SIZE, create_users, read_csv_rows
+
+
+class Command(BaseCommand):
+    """
+    Создает пользователей из файла JSON (список объектов) или CSV
+    с заголовком и ставит в очередь письма с кодами подтверждения.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Путь к файлу .json или .csv.')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=USERS_CHUNK_SIZE,
+            help='Количество пользователей в одной пачке.',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if options['chunk_size'] < 1:
+            raise CommandError('Размер пачки должен быть больше нуля.')
+        try:
+            with open(path, encoding='utf-8') as file:
+                if path.endswith('.csv'):
+                    rows = read_csv_rows(file.read())
+                else:
+                    rows = json.load(file)
+        except (OSError, ValueError) as error:
+            raise CommandError(f'Не удалось прочитать {path}: {error}')
+        if not isinstance(rows, list):
+            raise CommandError('Файл должен содержать список пользователей.')
+        users, errors = create_users(rows, options['chunk_size'])
+        for error in errors:
+            self.stderr.write(f'Строка {error["row"]}: {error["errors"]}')
+        self.stdout.write(f'Создано пользователей: {len(users)}')
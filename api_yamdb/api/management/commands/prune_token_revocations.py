@@ -0,0 +1,14 @@
+from django.core.management import BaseCommand
+
+from api.revocation import revocation_list
+
+
+class Command(BaseCommand):
+    """
+    Удаляет устаревшие записи об отозванных токенах.
+    Предназначена для периодического запуска (например, из cron).
+    """
+
+    def handle(self, *args, **options):
+        deleted = revocation_list.prune()
+        self.stdout.write(f'Удалено записей об отзыве токенов: {deleted}')
@@ -1,10 +1,47 @@
-from rest_framework import mixins, viewsets, filters
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import mixins, viewsets, filters, status
 from rest_framework.pagination import PageNumberPagination
 
+from .cache import catalog_versions
 from .permissions import IsAdminOrReadOnly
 
 
+class ConditionalGetMixin:
+    """
+    Условные GET-запросы по ETag и Last-Modified.
+    Валидаторы вычисляются по версиям наборов данных без сериализации,
+    при совпадении возвращается 304 без обращения к обработчику.
+    """
+
+    version_scopes = ()
+
+    def get_version_scopes(self):
+        """Возвращает наборы данных, от которых зависит ответ."""
+        return self.version_scopes
+
+    def conditional_response(self, request, handler, *args, **kwargs):
+        """Возвращает 304 или ответ обработчика с ETag и Last-Modified."""
+        etag, last_modified = catalog_versions.get_validators(
+            self.get_version_scopes(),
+            f'{request.accepted_renderer.format}:{request.get_full_path()}',
+        )
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (
+            status.HTTP_200_OK,
+            status.HTTP_304_NOT_MODIFIED,
+        ):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
 class CustomViewSet(
+    ConditionalGetMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
     mixins.ListModelMixin,
@@ -21,3 +58,9 @@ class CustomViewSet(
     def get_queryset(self):
         """Возвращает все объекты модели данных."""
         return self.queryset.all()
+
+    def list(self, request, *args, **kwargs):
+        """Возвращает список объектов с поддержкой условных запросов."""
+        return self.conditional_response(
+            request, super().list, *args, **kwargs
+        )
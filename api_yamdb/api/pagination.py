@@ -0,0 +1,136 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+INVALID_CURSOR_MESSAGE = 'Некорректный курсор.'
+
+
+class KeysetPagination(BasePagination):
+    """
+    Постраничный вывод по ключу сортировки.
+    Курсор хранит значения полей сортировки последнего объекта страницы,
+    поэтому следующая страница выбирается по индексу без OFFSET
+    и без подсчета общего количества объектов.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    ordering = ('-id', )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Возвращает страницу объектов, следующих за курсором."""
+        self.request = request
+        if hasattr(view, 'get_keyset_ordering'):
+            self.ordering = view.get_keyset_ordering()
+        else:
+            self.ordering = getattr(view, 'keyset_ordering', self.ordering)
+        self.model = queryset.model
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(position))
+        page = list(queryset[:self.page_size + 1])
+        self.has_next = len(page) > self.page_size
+        self.page = page[:self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_fields(self):
+        """Возвращает пары (поле модели, по убыванию) ключа сортировки."""
+        return [
+            (
+                self.model._meta.get_field(name.lstrip('-')),
+                name.startswith('-'),
+            )
+            for name in self.ordering
+        ]
+
+    def get_position_filter(self, position):
+        """
+        Условие выборки объектов после позиции курсора:
+        (a, b) > (x, y) раскрывается в a >= x AND (a > x OR a = x AND b > y).
+        """
+        fields = self.get_fields()
+        condition = Q()
+        equal = {}
+        for (field, descending), value in zip(fields, position):
+            lookup = 'lt' if descending else 'gt'
+            condition |= Q(**equal, **{f'{field.name}__{lookup}': value})
+            equal[field.name] = value
+        field, descending = fields[0]
+        lookup = 'lte' if descending else 'gte'
+        return Q(**{f'{field.name}__{lookup}': position[0]}) & condition
+
+    def decode_cursor(self, request):
+        """Возвращает позицию курсора из параметров запроса."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            fields = self.get_fields()
+            if not isinstance(values, list) or len(values) != len(fields):
+                raise ValueError
+            return [
+                field.to_python(value)
+                for (field, _), value in zip(fields, values)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(INVALID_CURSOR_MESSAGE)
+
+    def encode_cursor(self, obj):
+        """Кодирует значения полей сортировки объекта в курсор."""
+        values = [
+            field.value_to_string(obj) for field, _ in self.get_fields()
+        ]
+        return urlsafe_b64encode(json.dumps(values).encode()).decode('ascii')
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(self.page[-1]),
+        )
+
+
+class PageNumberOrKeysetPagination(PageNumberPagination):
+    """
+    Постраничный вывод по номеру страницы.
+    Если в запросе передан параметр cursor (в том числе пустой),
+    используется постраничный вывод по ключу сортировки.
+    """
+
+    keyset_pagination_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        cursor_param = self.keyset_pagination_class.cursor_query_param
+        if cursor_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+        self.keyset = self.keyset_pagination_class()
+        return self.keyset.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is None:
+            return super().get_paginated_response(data)
+        return self.keyset.get_paginated_response(data)
+
+
+class ActivityPagination(KeysetPagination):
+    """Постраничный вывод записей пользователя от новых к старым."""
+
+    ordering = ('-pub_date', '-id')
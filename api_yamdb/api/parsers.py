@@ -0,0 +1,19 @@
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from .provisioning import read_csv_rows
+
+
+class CSVParser(BaseParser):
+    """Разбирает CSV с заголовком в список словарей."""
+
+    media_type = 'text/csv'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            return read_csv_rows(stream.read().decode(encoding))
+        except UnicodeDecodeError as error:
+            raise ParseError(f'Некорректная кодировка CSV: {error}')
@@ -45,5 +45,5 @@ class IsAdminOrModerOrAuthor(permissions.BasePermission):
             request.method in permissions.SAFE_METHODS
             or request.user.is_admin
             or request.user.is_moder
-            or request.user == obj.author
+            or request.user.id == obj.author_id
         )
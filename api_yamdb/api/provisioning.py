@@ -0,0 +1,136 @@
+from csv import DictReader
+from io import StringIO
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from reviews.models import User
+from reviews.outbox import queue_emails
+from .serializers import UserBulkSerializer, get_confirmation_email
+
+USERS_CHUNK_SIZE = 500
+
+
+def read_csv_rows(text):
+    """
+    Читает строки CSV с заголовком в список словарей.
+    Пустые значения пропускаются, чтобы для них действовали
+    значения по умолчанию.
+    """
+    return [
+        {key: value for key, value in row.items() if value}
+        for row in DictReader(StringIO(text))
+    ]
+
+
+def find_duplicates(rows):
+    """Ошибки строк, повторяющих имя или email более ранних строк."""
+    errors = {}
+    seen = {'username': {}, 'email': {}}
+    for number, data in rows.items():
+        for field, values in seen.items():
+            first = values.setdefault(data[field], number)
+            if first != number:
+                errors.setdefault(number, {})[field] = [
+                    f'Значение повторяет строку {first}.'
+                ]
+    return errors
+
+
+def find_taken(rows):
+    """
+    Ошибки строк, имя или email которых уже заняты.
+    Проверка выполняется одним запросом для всего набора.
+    """
+    usernames = {data['username'] for data in rows.values()}
+    emails = {data['email'] for data in rows.values()}
+    taken = User.objects.filter(
+        Q(username__in=usernames) | Q(email__in=emails)
+    ).values_list('username', 'email')
+    taken_values = {'username': set(), 'email': set()}
+    for username, email in taken:
+        taken_values['username'].add(username)
+        taken_values['email'].add(email)
+    errors = {}
+    for number, data in rows.items():
+        for field, values in taken_values.items():
+            if data[field] in values:
+                errors.setdefault(number, {})[field] = [
+                    'Пользователь с таким значением уже существует.'
+                ]
+    return errors
+
+
+def create_chunk(rows, errors):
+    """
+    Создает пачку пользователей и ставит в очередь их письма.
+    Если имя или email успел занять параллельный запрос, строки
+    с конфликтами добавляются в errors, остальные создаются повторно.
+    """
+    while rows:
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(
+                    User(**data) for data in rows.values()
+                )
+        except IntegrityError:
+            taken = find_taken(rows)
+            if not taken:
+                raise
+            errors.update(taken)
+            rows = {
+                number: data for number, data in rows.items()
+                if number not in taken
+            }
+        else:
+            break
+    if not rows:
+        return []
+    # SQLite не возвращает id созданных строк, а они нужны
+    # для кодов подтверждения.
+    users = list(
+        User.objects.filter(
+            username__in=[data['username'] for data in rows.values()]
+        )
+    )
+    queue_emails(get_confirmation_email(user) for user in users)
+    return users
+
+
+def create_users(rows, chunk_size=USERS_CHUNK_SIZE):
+    """
+    Создает пользователей из списка словарей и ставит в очередь
+    письма с кодами подтверждения.
+    Пользователи создаются пачками по chunk_size в одной транзакции.
+    Возвращает созданных пользователей и ошибки строк
+    в виде списка {'row': номер строки, 'errors': ошибки полей}.
+    """
+    valid = {}
+    errors = {}
+    for number, row in enumerate(rows, start=1):
+        serializer = UserBulkSerializer(data=row)
+        if serializer.is_valid():
+            valid[number] = serializer.validated_data
+        else:
+            errors[number] = serializer.errors
+    for check in (find_duplicates, find_taken):
+        if not valid:
+            break
+        check_errors = check(valid)
+        for number, row_errors in check_errors.items():
+            errors[number] = row_errors
+            del valid[number]
+    numbers = list(valid)
+    created = []
+    with transaction.atomic():
+        for start in range(0, len(numbers), chunk_size):
+            created.extend(create_chunk(
+                {
+                    number: valid[number]
+                    for number in numbers[start:start + chunk_size]
+                },
+                errors,
+            ))
+    return created, [
+        {'row': number, 'errors': errors[number]} for number in sorted(errors)
+    ]
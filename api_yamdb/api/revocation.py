@@ -0,0 +1,132 @@
+from datetime import datetime
+from hashlib import blake2b
+from math import ceil, log
+from threading import Lock
+from time import time
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from reviews.models import TokenRevocation
+
+# Доля ложных срабатываний фильтра Блума, каждое стоит запроса к базе.
+FALSE_POSITIVE_RATE = 0.01
+MIN_FILTER_BITS = 1024
+
+
+class BloomFilter:
+    """
+    Фильтр Блума: отвечает «точно нет» или «возможно, есть».
+    Размер и число хеш-функций подбираются под ожидаемое
+    количество элементов и долю ложных срабатываний.
+    """
+
+    def __init__(self, capacity, false_positive_rate=FALSE_POSITIVE_RATE):
+        capacity = max(capacity, 1)
+        self.size = max(
+            MIN_FILTER_BITS,
+            ceil(-capacity * log(false_positive_rate) / log(2) ** 2),
+        )
+        self.hashes = max(1, round(self.size / capacity * log(2)))
+        self.bits = bytearray(ceil(self.size / 8))
+
+    def get_positions(self, item):
+        """Номера битов элемента (двойное хеширование)."""
+        digest = blake2b(str(item).encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        second = int.from_bytes(digest[8:], 'big') | 1
+        return [
+            (first + number * second) % self.size
+            for number in range(self.hashes)
+        ]
+
+    def add(self, item):
+        """Добавляет элемент в фильтр."""
+        for position in self.get_positions(item):
+            self.bits[position // 8] |= 1 << position % 8
+
+    def __contains__(self, item):
+        return all(
+            self.bits[position // 8] & 1 << position % 8
+            for position in self.get_positions(item)
+        )
+
+
+class RevocationList:
+    """
+    Список пользователей с отозванными токенами.
+    Перед таблицей TokenRevocation стоит фильтр Блума в памяти процесса:
+    для большинства пользователей без отозванных токенов проверка
+    обходится без запроса к базе, а совпадения по фильтру
+    подтверждаются по таблице.
+    Фильтр перестраивается из таблицы раз в
+    TOKEN_REVOCATION_REFRESH_INTERVAL секунд, поэтому отзыв в другом
+    процессе начинает действовать не позже, чем через этот интервал.
+    """
+
+    def __init__(self):
+        self.filter = None
+        self.loaded_at = 0
+        self._lock = Lock()
+
+    def refresh(self):
+        """Перестраивает фильтр по таблице, не изменяя ее."""
+        user_ids = list(
+            TokenRevocation.objects.values_list('user_id', flat=True)
+        )
+        bloom_filter = BloomFilter(len(user_ids) * 2)
+        for user_id in user_ids:
+            bloom_filter.add(user_id)
+        self.filter = bloom_filter
+        self.loaded_at = time()
+
+    def get_filter(self):
+        """Возвращает фильтр, перестраивая его по истечении интервала."""
+        with self._lock:
+            if (
+                self.filter is None
+                or time() - self.loaded_at
+                > settings.TOKEN_REVOCATION_REFRESH_INTERVAL
+            ):
+                self.refresh()
+            return self.filter
+
+    def is_revoked(self, user_id, issued_at):
+        """Проверяет, отозван ли токен, выданный в issued_at (timestamp)."""
+        if user_id not in self.get_filter():
+            return False
+        return TokenRevocation.objects.filter(
+            user_id=user_id,
+            revoked_at__gte=datetime.fromtimestamp(
+                issued_at, tz=timezone.utc
+            ),
+        ).exists()
+
+    def revoke(self, user_id):
+        """Отзывает все выданные пользователю токены."""
+        TokenRevocation.objects.update_or_create(
+            user_id=user_id, defaults={'revoked_at': timezone.now()}
+        )
+        self.get_filter().add(user_id)
+
+    def prune(self):
+        """
+        Удаляет записи старше срока жизни токена обновления:
+        выданных до них токенов уже не осталось.
+        Возвращает количество удаленных записей.
+        """
+        deleted, _ = TokenRevocation.objects.filter(
+            revoked_at__lt=(
+                timezone.now() - jwt_settings.REFRESH_TOKEN_LIFETIME
+            )
+        ).delete()
+        return deleted
+
+    def reset(self):
+        """Сбрасывает фильтр; он будет построен при следующей проверке."""
+        with self._lock:
+            self.filter = None
+
+
+revocation_list = RevocationList()
@@ -1,12 +1,14 @@
 from datetime import datetime
 
 from rest_framework import serializers
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.shortcuts import get_object_or_404
 from django.core.exceptions import ValidationError
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 
 from reviews.models import (
     Category,
@@ -20,11 +22,59 @@ from reviews.models import (
     MAX_SCORE,
     MAX_LENGTH_USERNAME,
 )
+from reviews.outbox import queue_emails
 from validators import validate_username
+from .authentication import (
+    UserClaimsRefreshToken,
+    check_token_revoked,
+    check_token_version,
+    check_user_active,
+)
 
 
 MAX_LENGTH_EMAIL = 254
 START_YEAR = 1
+TOP_TITLES_LIMIT = 10
+MAX_TOP_TITLES_LIMIT = 100
+MAX_TITLE_IDS = 200
+CHANGES_LIMIT = 500
+MAX_CHANGES_LIMIT = 1000
+FIELDS_QUERY_PARAM = 'fields'
+
+
+def get_requested_fields(request, allowed):
+    """
+    Возвращает множество полей из параметра fields GET-запроса
+    или None, если запрошены все поля.
+    Поля, которых нет среди allowed, дают ошибку 400.
+    """
+    if request is None or request.method != 'GET':
+        return None
+    value = request.query_params.get(FIELDS_QUERY_PARAM)
+    if not value:
+        return None
+    fields = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = fields - set(allowed)
+    if unknown:
+        raise serializers.ValidationError({
+            FIELDS_QUERY_PARAM: [
+                f'Неизвестные поля: {", ".join(sorted(unknown))}.'
+            ]
+        })
+    return fields
+
+
+class SparseFieldsMixin:
+    """Оставляет в ответе только поля, перечисленные в параметре fields."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = get_requested_fields(
+            self.context.get('request'), self.fields
+        )
+        if requested is not None:
+            for name in set(self.fields) - requested:
+                self.fields.pop(name)
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -64,6 +114,30 @@ class UserSerializer(serializers.ModelSerializer):
         return username
 
 
+class UserBulkSerializer(UserSerializer):
+    """
+    Сериализатор строки массового создания пользователей.
+    Уникальность имени и email проверяется сразу для всего набора.
+    """
+
+    email = serializers.EmailField(max_length=MAX_LENGTH_EMAIL)
+
+    def validate_username(self, username):
+        """Занятость имени проверяется сразу для всего набора."""
+        return username
+
+
+def get_confirmation_email(user):
+    """Письмо (получатель, тема, текст) с кодом подтверждения."""
+    confirmation_code = default_token_generator.make_token(user)
+    subject = 'Подтверждение email-адреса'
+    message = (
+        'Пожалуйста, используйте этот код подтверждения для '
+        f'активации вашей учетной записи: {confirmation_code}'
+    )
+    return user.email, subject, message
+
+
 class UserSignupSerializer(serializers.Serializer):
     """Сериализатор для регистрации пользователя."""
 
@@ -73,26 +147,6 @@ class UserSignupSerializer(serializers.Serializer):
         validators=[validate_username]
     )
 
-    def validate_email(self, email):
-        """Валидация email пользователя."""
-        username = self.initial_data.get('username')
-        if (
-            User.objects.filter(email=email).exists()
-            and not User.objects.filter(username=username).exists()
-        ):
-            raise serializers.ValidationError(
-                'Пользователь с таким email уже зарегистрирован.'
-            )
-
-        if User.objects.filter(username=username).exists():
-            user = User.objects.get(username=username)
-            if email != user.email:
-                raise serializers.ValidationError(
-                    'Указан неверный email.'
-                )
-
-        return email
-
     def validate_username(self, username):
         """Валидация имени пользователя."""
         if username == 'me':
@@ -101,28 +155,51 @@ class UserSignupSerializer(serializers.Serializer):
             )
         return username
 
-    def create(self, validated_data):
-        """Регистрация пользователя."""
-        user, created = User.objects.get_or_create(
-            email=validated_data['email'],
-            defaults={
-                'username': validated_data['username'],
-                'is_active': False,
-            },
-        )
-        confirmation_code = default_token_generator.make_token(user)
-        subject = 'Подтверждение email-адреса'
-        message = (
-            'Пожалуйста, используйте этот код подтверждения для '
-            f'активации вашей учетной записи: {confirmation_code}'
+    def validate(self, attrs):
+        """
+        Проверка, что email и имя пользователя свободны
+        или принадлежат одному и тому же пользователю.
+        Все случаи решаются по одному запросу к базе данных.
+        """
+        email = attrs['email']
+        username = attrs['username']
+        users = list(
+            User.objects.filter(Q(email=email) | Q(username=username))[:2]
         )
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=None,
-            recipient_list=[validated_data['email']],
-            fail_silently=False,
+        user = next(
+            (found for found in users if found.username == username), None
         )
+        if user is not None and user.email != email:
+            raise serializers.ValidationError(
+                {'email': 'Указан неверный email.'}
+            )
+        if user is None and users:
+            raise serializers.ValidationError(
+                {'email': 'Пользователь с таким email уже зарегистрирован.'}
+            )
+        attrs['user'] = user
+        return attrs
+
+    def create(self, validated_data):
+        """
+        Регистрация пользователя.
+        Письмо с кодом подтверждения ставится в очередь
+        в одной транзакции с пользователем.
+        """
+        user = validated_data['user']
+        try:
+            with transaction.atomic():
+                if user is None:
+                    user = User.objects.create(
+                        email=validated_data['email'],
+                        username=validated_data['username'],
+                        is_active=False,
+                    )
+                queue_emails([get_confirmation_email(user)])
+        except IntegrityError:
+            raise serializers.ValidationError(
+                'Пользователь с таким email или именем уже зарегистрирован.'
+            )
         return user
 
 
@@ -150,10 +227,42 @@ class UserTokenSerializer(serializers.Serializer):
         user.is_active = True
         user.save()
 
-        refresh = RefreshToken.for_user(user)
-        token = str(refresh.access_token)
+        refresh = UserClaimsRefreshToken.for_user(user)
+        attrs['token'] = str(refresh.access_token)
+        attrs['refresh'] = str(refresh)
+        return attrs
+
+
+class UserTokenRefreshSerializer(serializers.Serializer):
+    """
+    Сериализатор для обновления токена.
+    Данные пользователя берутся из токена обновления, версия
+    токенов — из кэша. Замененный токен обновления заносится
+    в черный список и повторно не принимается.
+    """
 
-        attrs['token'] = token
+    refresh = serializers.CharField()
+
+    def validate(self, attrs):
+        """Выдача нового токена доступа и нового токена обновления."""
+        try:
+            refresh = UserClaimsRefreshToken(attrs['refresh'])
+        except TokenError as error:
+            raise InvalidToken(error.args[0])
+        check_token_revoked(refresh)
+        check_user_active(refresh)
+        check_token_version(refresh)
+        attrs['token'] = str(refresh.access_token)
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            if jwt_settings.BLACKLIST_AFTER_ROTATION:
+                _, created = refresh.blacklist()
+                if not created:
+                    # Токен успел заменить параллельный запрос.
+                    raise InvalidToken('Токен уже использован')
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+        attrs['refresh'] = str(refresh)
         return attrs
 
 
@@ -173,7 +282,7 @@ class GenreSerializer(serializers.ModelSerializer):
         exclude = ('id', )
 
 
-class TitleSerializer(serializers.ModelSerializer):
+class TitleSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор модели Title."""
 
     genre = GenreSerializer(many=True)
@@ -182,7 +291,15 @@ class TitleSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Title
-        fields = '__all__'
+        fields = (
+            'id',
+            'name',
+            'year',
+            'rating',
+            'description',
+            'genre',
+            'category',
+        )
 
 
 class TitleCreateSerializer(serializers.ModelSerializer):
@@ -200,7 +317,14 @@ class TitleCreateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Title
-        fields = '__all__'
+        fields = (
+            'id',
+            'name',
+            'year',
+            'description',
+            'genre',
+            'category',
+        )
 
     def validate_year(self, year):
         """Валидатор поля year."""
@@ -216,7 +340,44 @@ class TitleCreateSerializer(serializers.ModelSerializer):
         return year
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class TopTitlesQuerySerializer(serializers.Serializer):
+    """Сериализатор параметров запроса лучших произведений."""
+
+    category = serializers.CharField(required=False)
+    genre = serializers.CharField(required=False)
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=MAX_TOP_TITLES_LIMIT,
+        default=TOP_TITLES_LIMIT
+    )
+
+
+class TitleIdsQuerySerializer(serializers.Serializer):
+    """Сериализатор списка id произведений через запятую."""
+
+    ids = serializers.CharField()
+
+    def validate_ids(self, ids):
+        """Преобразует строку в список уникальных id с сохранением порядка."""
+        try:
+            title_ids = [int(pk) for pk in ids.split(',') if pk.strip()]
+        except ValueError:
+            raise serializers.ValidationError(
+                'Передайте id произведений через запятую.'
+            )
+        title_ids = list(dict.fromkeys(title_ids))
+        if not title_ids:
+            raise serializers.ValidationError(
+                'Передайте хотя бы один id произведения.'
+            )
+        if len(title_ids) > MAX_TITLE_IDS:
+            raise serializers.ValidationError(
+                f'Можно запросить не более {MAX_TITLE_IDS} произведений.'
+            )
+        return title_ids
+
+
+class ReviewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор модели Review."""
     author = serializers.SlugRelatedField(
         slug_field='username',
@@ -233,28 +394,10 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
         read_only_fields = ('title', 'author')
 
-    def validate(self, data):
-        """Валидируем уникальность отзыва."""
-        request = self.context['request']
-        author = request.user
-        title_id = self.context.get('view').kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
-        if (
-            request.method == 'POST'
-            and Review.objects.filter(title=title, author=author).exists()
-        ):
-            raise ValidationError(
-                'Больше одного отзыва отзыва написать нельзя'
-            )
-        return data
-
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор модели Comment."""
-    review = serializers.SlugRelatedField(
-        slug_field='text',
-        read_only=True
-    )
+    review = serializers.PrimaryKeyRelatedField(read_only=True)
     author = serializers.SlugRelatedField(
         slug_field='username',
         read_only=True
@@ -263,3 +406,14 @@ class CommentSerializer(serializers.ModelSerializer):
     class Meta:
         fields = '__all__'
         model = Comment
+
+
+class ChangesQuerySerializer(serializers.Serializer):
+    """Сериализатор параметров запроса журнала изменений."""
+
+    since = serializers.IntegerField(min_value=0, default=0)
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=MAX_CHANGES_LIMIT,
+        default=CHANGES_LIMIT
+    )
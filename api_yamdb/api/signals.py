@@ -0,0 +1,145 @@
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+
+from reviews.models import Category, Genre, GenreTitle, Review, Title, User
+from .cache import (
+    CATEGORIES_SCOPE,
+    GENRES_SCOPE,
+    TITLE_SCOPE,
+    TITLES_SCOPE,
+    catalog_versions,
+    title_cache,
+    token_versions,
+)
+from .revocation import revocation_list
+
+
+def bump_versions(scopes):
+    """Обновляет версии наборов данных после фиксации транзакции."""
+    transaction.on_commit(lambda: catalog_versions.bump(scopes))
+
+
+def invalidate_titles(title_ids):
+    """
+    Сбрасывает кэш произведений и обновляет их версии
+    после фиксации транзакции.
+    """
+    title_ids = list(title_ids)
+    if not title_ids:
+        return
+    transaction.on_commit(lambda: title_cache.invalidate(title_ids))
+    bump_versions(
+        [TITLES_SCOPE, *(TITLE_SCOPE.format(pk) for pk in title_ids)]
+    )
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def title_changed(sender, instance, **kwargs):
+    """Сбрасывает кэш измененного произведения."""
+    invalidate_titles([instance.pk])
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def title_related_changed(sender, instance, **kwargs):
+    """Сбрасывает кэш произведения при изменении его жанров или отзывов."""
+    invalidate_titles([instance.title_id])
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    """
+    Сбрасывает кэш при изменении жанров через менеджер связей.
+    Связи при очистке собираются до их удаления.
+    """
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        invalidate_titles([instance.pk])
+    elif pk_set:
+        invalidate_titles(pk_set)
+    else:
+        invalidate_titles(
+            GenreTitle.objects.filter(genre=instance).values_list(
+                'title_id', flat=True
+            )
+        )
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def category_changed(sender, instance, **kwargs):
+    """
+    Сбрасывает кэш произведений категории.
+    При удалении список произведений собирается до того,
+    как у них будет обнулена категория.
+    """
+    invalidate_titles(
+        Title.objects.filter(category=instance).values_list('id', flat=True)
+    )
+
+
+@receiver(post_save, sender=Genre)
+def genre_changed(sender, instance, **kwargs):
+    """
+    Сбрасывает кэш произведений жанра.
+    При удалении жанра его связи удаляются каскадно
+    и сбрасывают кэш через обработчик GenreTitle.
+    """
+    invalidate_titles(
+        GenreTitle.objects.filter(genre_id=instance.pk).values_list(
+            'title_id', flat=True
+        )
+    )
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def categories_changed(sender, **kwargs):
+    """Обновляет версию списка категорий."""
+    bump_versions([CATEGORIES_SCOPE])
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def genres_changed(sender, **kwargs):
+    """Обновляет версию списка жанров."""
+    bump_versions([GENRES_SCOPE])
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, **kwargs):
+    """
+    Отзывает токены пользователя при изменении данных,
+    которые в них попадают. Деактивация пользователя
+    также заносит его в список отозванных токенов.
+    """
+    claims = instance.get_claims()
+    loaded_claims = getattr(instance, '_loaded_claims', None)
+    if created or (claims is not None and claims == loaded_claims):
+        instance._loaded_claims = claims
+        return
+    if not instance.is_active and (
+        loaded_claims is None or loaded_claims['is_active']
+    ):
+        revocation_list.revoke(instance.pk)
+    token_versions.bump(instance.pk)
+    instance.refresh_from_db(fields=['token_version'])
+    instance._loaded_claims = claims
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    """Отзывает токены удаленного пользователя."""
+    token_versions.invalidate(instance.pk)
+    revocation_list.revoke(instance.pk)
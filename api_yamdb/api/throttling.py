@@ -0,0 +1,198 @@
+import sqlite3
+from functools import lru_cache
+from threading import Lock, local
+from time import time
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import SimpleRateThrottle
+
+# Через сколько обращений к хранилищу удаляются заполненные корзины.
+PURGE_INTERVAL = 1000
+
+
+def take_token(bucket, now, capacity, duration):
+    """
+    Забирает из корзины один токен.
+    Корзина вмещает capacity токенов и заполняется целиком за duration
+    секунд; bucket — пара (токены, время обновления) или None для полной.
+    Возвращает новые токены, время, когда корзина снова станет полной,
+    и сколько секунд ждать, если токенов не хватило (иначе 0).
+    """
+    refill = capacity / duration
+    if bucket is None:
+        tokens = capacity
+    else:
+        tokens, updated = bucket
+        tokens = min(capacity, tokens + (now - updated) * refill)
+    if tokens < 1:
+        wait = (1 - tokens) / refill
+    else:
+        tokens -= 1
+        wait = 0
+    return tokens, now + (capacity - tokens) / refill, wait
+
+
+class LocalThrottleStore:
+    """
+    Хранилище счетчиков в памяти процесса.
+    Подходит для разработки и запуска в одном процессе.
+    """
+
+    def __init__(self):
+        self.buckets = {}
+        self.calls = 0
+        self._lock = Lock()
+
+    def take(self, key, capacity, duration):
+        """Забирает токен из корзины key и возвращает время ожидания."""
+        now = time()
+        with self._lock:
+            bucket = self.buckets.get(key)
+            tokens, full_at, wait = take_token(
+                bucket and bucket[:2], now, capacity, duration
+            )
+            self.buckets[key] = (tokens, now, full_at)
+            self.calls += 1
+            if self.calls % PURGE_INTERVAL == 0:
+                self.buckets = {
+                    key: bucket for key, bucket in self.buckets.items()
+                    if bucket[2] > now
+                }
+        return wait
+
+    def clear(self):
+        """Удаляет все счетчики."""
+        with self._lock:
+            self.buckets = {}
+
+
+class SQLiteThrottleStore:
+    """
+    Хранилище счетчиков в файле SQLite.
+    Счетчики общие для всех процессов на одном сервере;
+    корзина изменяется в транзакции с блокировкой записи.
+    """
+
+    table = 'throttle_bucket'
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.calls = 0
+        self._local = local()
+
+    def get_connection(self):
+        """Возвращает соединение текущего потока."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=5, isolation_level=None
+            )
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                f'CREATE TABLE IF NOT EXISTS {self.table} ('
+                'key TEXT PRIMARY KEY, tokens REAL, updated REAL, '
+                'full_at REAL)'
+            )
+            self._local.connection = connection
+        return connection
+
+    def take(self, key, capacity, duration):
+        """Забирает токен из корзины key и возвращает время ожидания."""
+        connection = self.get_connection()
+        now = time()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            bucket = connection.execute(
+                f'SELECT tokens, updated FROM {self.table} WHERE key = ?',
+                [key],
+            ).fetchone()
+            tokens, full_at, wait = take_token(
+                bucket, now, capacity, duration
+            )
+            connection.execute(
+                f'INSERT OR REPLACE INTO {self.table} '
+                '(key, tokens, updated, full_at) VALUES (?, ?, ?, ?)',
+                [key, tokens, now, full_at],
+            )
+            self.calls += 1
+            if self.calls % PURGE_INTERVAL == 0:
+                connection.execute(
+                    f'DELETE FROM {self.table} WHERE full_at <= ?', [now]
+                )
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        return wait
+
+    def clear(self):
+        """Удаляет все счетчики."""
+        self.get_connection().execute(f'DELETE FROM {self.table}')
+
+
+@lru_cache(maxsize=None)
+def get_throttle_store():
+    """Хранилище счетчиков из настройки THROTTLE_STORE."""
+    store_class = import_string(settings.THROTTLE_STORE)
+    return store_class(**settings.THROTTLE_STORE_OPTIONS)
+
+
+class BucketRateThrottle(SimpleRateThrottle):
+    """
+    Ограничение частоты запросов по алгоритму token bucket.
+    Частота из DEFAULT_THROTTLE_RATES задает размер корзины
+    и время ее полного заполнения: запросы можно отправлять
+    пачкой до размера корзины, дальше — равномерно.
+    Пользователи различаются по id, анонимные — по IP-адресу.
+    """
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.wait_time = get_throttle_store().take(
+            self.get_cache_key(request, view),
+            self.num_requests,
+            self.duration,
+        )
+        return not self.wait_time
+
+    def wait(self):
+        return self.wait_time
+
+
+class SignupRateThrottle(BucketRateThrottle):
+    """Ограничение частоты регистрации."""
+
+    scope = 'signup'
+
+
+class TokenRateThrottle(BucketRateThrottle):
+    """Ограничение частоты получения токенов."""
+
+    scope = 'token'
+
+
+class ReadWriteRateThrottle(BucketRateThrottle):
+    """Раздельные ограничения для чтения (reads) и изменения (writes)."""
+
+    def __init__(self):
+        # Область ограничения зависит от метода запроса.
+        pass
+
+    def allow_request(self, request, view):
+        if request.method in SAFE_METHODS:
+            self.scope = 'reads'
+        else:
+            self.scope = 'writes'
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
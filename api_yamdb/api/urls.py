@@ -3,12 +3,14 @@ from rest_framework.routers import DefaultRouter
 
 from .views import (
     CategoryViewSet,
+    ChangesView,
     GenreViewSet,
     TitleViewSet,
     CommentViewSet,
     ReviewViewSet,
     UserViewSet,
     UserSignupView,
+    UserTokenRefreshView,
     UserTokenView
 )
 
@@ -34,4 +36,10 @@ urlpatterns = [
     path('v1/', include(router_v1.urls)),
     path('v1/auth/signup/', UserSignupView.as_view(), name='user_signup'),
     path('v1/auth/token/', UserTokenView.as_view(), name='user_token'),
+    path(
+        'v1/auth/token/refresh/',
+        UserTokenRefreshView.as_view(),
+        name='user_token_refresh'
+    ),
+    path('v1/changes/', ChangesView.as_view(), name='changes'),
 ]
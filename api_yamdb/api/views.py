@@ -1,38 +1,81 @@
-from django.db.models import Avg
 from django_filters.rest_framework import (
     CharFilter,
     DjangoFilterBackend,
     FilterSet,
     NumberFilter,
 )
+from django.db import IntegrityError, transaction
 from django.shortcuts import get_object_or_404
 from rest_framework import filters, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import JSONParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
-from reviews.models import Category, Genre, Review, Title, User
+from reviews.models import (
+    MAX_SCORE,
+    MIN_SCORE,
+    Category,
+    Change,
+    Comment,
+    Genre,
+    Review,
+    ScoreCount,
+    Title,
+    TitleRanking,
+    User,
+)
+from reviews.search import search_titles
 from .permissions import IsAdmin, IsAdminOrModerOrAuthor, IsAdminOrReadOnly
 from .serializers import (
     CategorySerializer,
+    ChangesQuerySerializer,
     CommentSerializer,
     GenreSerializer,
     ReviewSerializer,
     TitleCreateSerializer,
+    TitleIdsQuerySerializer,
     TitleSerializer,
+    TopTitlesQuerySerializer,
+    get_requested_fields,
     UserSerializer,
     UserSignupSerializer,
+    UserTokenRefreshSerializer,
     UserTokenSerializer,
 )
-from .mixins import CustomViewSet
+from .authentication import UserClaimsJWTAuthentication
+from .cache import (
+    CATEGORIES_SCOPE,
+    GENRES_SCOPE,
+    TITLE_SCOPE,
+    TITLES_SCOPE,
+    title_cache,
+)
+from .mixins import ConditionalGetMixin, CustomViewSet
+from .pagination import ActivityPagination, PageNumberOrKeysetPagination
+from .parsers import CSVParser
+from .provisioning import create_users
+from .throttling import SignupRateThrottle, TokenRateThrottle
+
+REVIEW_FIELDS = (
+    'id', 'text', 'score', 'pub_date', 'comments_count', 'title',
+    'author', 'author__username',
+)
+COMMENT_FIELDS = (
+    'id', 'text', 'pub_date', 'review', 'author', 'author__username',
+)
+MAX_BULK_USERS = 5000
+CHANGES_KEYS = {'title': 'titles', 'review': 'reviews', 'comment': 'comments'}
 
 
 class UserSignupView(APIView):
     """Вьюсет для регистрации пользователя."""
 
     serializer_class = UserSignupSerializer
+    throttle_classes = (SignupRateThrottle,)
 
     def post(self, request):
         """Регистрация пользователя."""
@@ -46,12 +89,31 @@ class UserTokenView(APIView):
     """Вьюсет для получения токена авторизации."""
 
     serializer_class = UserTokenSerializer
+    throttle_classes = (TokenRateThrottle,)
 
     def post(self, request):
         """Создание токена для авторизации пользователя."""
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
-        return Response({'token': serializer.validated_data['token']})
+        return Response({
+            'token': serializer.validated_data['token'],
+            'refresh': serializer.validated_data['refresh'],
+        })
+
+
+class UserTokenRefreshView(UserTokenView):
+    """
+    Вьюсет для обновления токена авторизации.
+    Аутентификация не выполняется: у клиента, обновляющего токен,
+    токен доступа обычно уже истек.
+    """
+
+    serializer_class = UserTokenRefreshSerializer
+    authentication_classes = ()
+
+    def get_authenticate_header(self, request):
+        """Недействительный токен обновления дает ответ 401, а не 403."""
+        return UserClaimsJWTAuthentication().authenticate_header(request)
 
 
 class UserViewSet(viewsets.ModelViewSet):
@@ -73,7 +135,7 @@ class UserViewSet(viewsets.ModelViewSet):
     def me(self, request):
         """Возврат или редактирование данных пользователя."""
         serializer = self.get_serializer_class()
-        user = get_object_or_404(User, username=request.user.username)
+        user = get_object_or_404(User, pk=request.user.pk)
         if self.request.method == 'PATCH':
             serializer = serializer(user, request.data, partial=True)
             if serializer.is_valid():
@@ -90,6 +152,102 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer = serializer(user)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    def get_activity_response(self, author_id, queryset, serializer_class):
+        """
+        Записи автора от новых к старым с выводом по курсору.
+        Выборка идет по индексу (author, pub_date, id)
+        и не зависит от общего количества записей автора.
+        """
+        queryset = queryset.filter(
+            author_id=author_id
+        ).select_related('author')
+        paginator = ActivityPagination()
+        page = paginator.paginate_queryset(queryset, self.request, view=self)
+        serializer = serializer_class(
+            page, many=True, context=self.get_serializer_context()
+        )
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(
+        detail=False,
+        url_path='me/reviews',
+        permission_classes=[IsAuthenticated]
+    )
+    def me_reviews(self, request):
+        """Отзывы текущего пользователя."""
+        return self.get_activity_response(
+            request.user.id,
+            Review.objects.only(*REVIEW_FIELDS),
+            ReviewSerializer
+        )
+
+    @action(
+        detail=False,
+        url_path='me/comments',
+        permission_classes=[IsAuthenticated]
+    )
+    def me_comments(self, request):
+        """Комментарии текущего пользователя."""
+        return self.get_activity_response(
+            request.user.id,
+            Comment.objects.only(*COMMENT_FIELDS),
+            CommentSerializer
+        )
+
+    @action(detail=True)
+    def reviews(self, request, username=None):
+        """Отзывы пользователя для администратора."""
+        return self.get_activity_response(
+            self.get_object().id,
+            Review.objects.only(*REVIEW_FIELDS),
+            ReviewSerializer
+        )
+
+    @action(detail=True)
+    def comments(self, request, username=None):
+        """Комментарии пользователя для администратора."""
+        return self.get_activity_response(
+            self.get_object().id,
+            Comment.objects.only(*COMMENT_FIELDS),
+            CommentSerializer
+        )
+
+    @action(
+        methods=['POST'],
+        detail=False,
+        parser_classes=(JSONParser, CSVParser)
+    )
+    def bulk(self, request):
+        """
+        Массовое создание пользователей из списка JSON или CSV.
+        Строки с ошибками пропускаются и возвращаются в поле errors.
+        """
+        rows = request.data
+        if not isinstance(rows, list) or not rows:
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Передайте непустой список пользователей.'
+                ]
+            })
+        if len(rows) > MAX_BULK_USERS:
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    f'Можно создать не более {MAX_BULK_USERS} '
+                    'пользователей за один запрос.'
+                ]
+            })
+        users, errors = create_users(rows)
+        return Response(
+            {
+                'created': [user.username for user in users],
+                'errors': errors,
+            },
+            status=(
+                status.HTTP_201_CREATED if users
+                else status.HTTP_400_BAD_REQUEST
+            )
+        )
+
     def destroy(self, request, pk=None, *args, **kwargs):
         """Удаление пользователя."""
         if pk == 'me':
@@ -105,6 +263,7 @@ class CategoryViewSet(CustomViewSet):
 
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    version_scopes = (CATEGORIES_SCOPE, )
 
 
 class GenreViewSet(CustomViewSet):
@@ -112,6 +271,7 @@ class GenreViewSet(CustomViewSet):
 
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    version_scopes = (GENRES_SCOPE, )
 
 
 class TitleFilterSet(FilterSet):
@@ -121,22 +281,90 @@ class TitleFilterSet(FilterSet):
     category = CharFilter(field_name='category__slug')
     name = CharFilter()
     year = NumberFilter()
+    q = CharFilter(method='filter_search')
 
     class Meta:
         model = Title
         fields = []
 
+    def filter_search(self, queryset, name, value):
+        """Полнотекстовый поиск по названию и описанию произведения."""
+        return search_titles(queryset, value)
 
-class TitleViewSet(viewsets.ModelViewSet):
+
+class ReviewFilterSet(FilterSet):
+    """Фильтрация для отзывов."""
+
+    score__gte = NumberFilter(field_name='score', lookup_expr='gte')
+    score__lte = NumberFilter(field_name='score', lookup_expr='lte')
+    author = CharFilter(field_name='author__username')
+
+    class Meta:
+        model = Review
+        fields = []
+
+
+class TieBreakOrderingFilter(filters.OrderingFilter):
+    """
+    Сортировка по параметру ordering.
+    Последним полем добавляется id в том же направлении,
+    что и у последнего поля сортировки: порядок получается однозначным
+    и совпадает с составными индексами (..., id).
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = list(super().get_ordering(request, queryset, view))
+        if ordering and ordering[-1].lstrip('-') != 'id':
+            direction = '-' if ordering[-1].startswith('-') else ''
+            ordering.append(f'{direction}id')
+        return tuple(ordering)
+
+
+class TitleViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """Вьюсет для произведений."""
 
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
-    ).all()
+    queryset = Title.objects.all()
     serializer_class = TitleSerializer
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilterSet
     permission_classes = (IsAdminOrReadOnly, )
+    pagination_class = PageNumberOrKeysetPagination
+    keyset_ordering = ('id', )
+    lookup_value_regex = r'\d+'
+
+    # Колонки модели, которые нужны для вывода полей сериализатора.
+    field_columns = {
+        'name': ('name', ),
+        'year': ('year', ),
+        'rating': ('rating_sum', 'rating_count'),
+        'description': ('description', ),
+        'category': ('category', ),
+    }
+
+    def get_queryset(self):
+        """
+        Возвращает произведения с категорией и жанрами.
+        Если запрошена часть полей, загружает только нужные колонки
+        и связи.
+        """
+        fields = get_requested_fields(
+            self.request, TitleSerializer.Meta.fields
+        )
+        if fields is None:
+            return self.queryset.select_related(
+                'category'
+            ).prefetch_related('genre')
+        queryset = self.queryset.only(*(
+            column
+            for field, columns in self.field_columns.items()
+            if field in fields
+            for column in columns
+        ))
+        if 'category' in fields:
+            queryset = queryset.select_related('category')
+        if 'genre' in fields:
+            queryset = queryset.prefetch_related('genre')
+        return queryset
 
     def get_serializer_class(self):
         """Определяет сериализатор для произведений."""
@@ -144,28 +372,176 @@ class TitleViewSet(viewsets.ModelViewSet):
             return TitleCreateSerializer
         return TitleSerializer
 
+    def get_version_scopes(self):
+        """Версии наборов данных для условных запросов."""
+        if self.action == 'retrieve':
+            return (
+                TITLE_SCOPE.format(int(self.kwargs[self.lookup_field])),
+            )
+        return (TITLES_SCOPE, )
+
+    def list(self, request, *args, **kwargs):
+        """Возвращает список произведений с поддержкой условных запросов."""
+        return self.conditional_response(
+            request, self.list_titles, *args, **kwargs
+        )
+
+    def list_titles(self, request, *args, **kwargs):
+        """
+        Возвращает список произведений.
+        С параметром ids возвращает произведения по списку id
+        в порядке запроса, без пагинации и фильтрации.
+        """
+        if 'ids' not in request.query_params:
+            return super().list(request, *args, **kwargs)
+        params = TitleIdsQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        title_ids = params.validated_data['ids']
+        titles = self.get_queryset().in_bulk(title_ids)
+        serializer = self.get_serializer(
+            [titles[pk] for pk in title_ids if pk in titles], many=True
+        )
+        return Response({
+            'results': serializer.data,
+            'missing': [pk for pk in title_ids if pk not in titles],
+        })
+
+    def retrieve(self, request, *args, **kwargs):
+        """Возвращает произведение с поддержкой условных запросов."""
+        return self.conditional_response(
+            request, self.retrieve_title, *args, **kwargs
+        )
+
+    def retrieve_title(self, request, *args, **kwargs):
+        """
+        Возвращает произведение из кэша или из базы данных.
+        В кэше хранится полное представление, при запросе части полей
+        оно сокращается.
+        """
+        fields = get_requested_fields(request, TitleSerializer.Meta.fields)
+        data = title_cache.get(int(kwargs[self.lookup_field]))
+        if data is not None:
+            if fields is not None:
+                data = {
+                    name: value for name, value in data.items()
+                    if name in fields
+                }
+            return Response(data)
+        response = super().retrieve(request, *args, **kwargs)
+        if fields is None:
+            title_cache.set(response.data['id'], response.data)
+        return response
+
+    @action(detail=False)
+    def top(self, request):
+        """
+        Лучшие произведения по байесовскому среднему.
+        Читает материализованный рейтинг по индексу.
+        """
+        params = TopTitlesQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        if 'genre' in params.validated_data:
+            rankings = TitleRanking.objects.filter(
+                genre__slug=params.validated_data['genre']
+            )
+        else:
+            rankings = TitleRanking.objects.filter(genre__isnull=True)
+        if 'category' in params.validated_data:
+            rankings = rankings.filter(
+                category__slug=params.validated_data['category']
+            )
+        title_ids = list(
+            rankings.order_by('-score', 'title_id').values_list(
+                'title_id', flat=True
+            )[:params.validated_data['limit']]
+        )
+        titles = self.get_queryset().in_bulk(title_ids)
+        serializer = self.get_serializer(
+            [titles[pk] for pk in title_ids if pk in titles], many=True
+        )
+        return Response(serializer.data)
+
+    @action(detail=True, url_path='rating-histogram')
+    def rating_histogram(self, request, pk=None):
+        """Распределение оценок произведения по значениям."""
+        counts = dict(
+            ScoreCount.objects.filter(title_id=pk).values_list(
+                'score', 'count'
+            )
+        )
+        if not counts and not Title.objects.filter(pk=pk).exists():
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        histogram = [
+            {'score': score, 'count': counts.get(score, 0)}
+            for score in range(MIN_SCORE, MAX_SCORE + 1)
+        ]
+        return Response({
+            'title': int(pk),
+            'count': sum(counts.values()),
+            'histogram': histogram,
+        })
+
 
 class ReviewViewSet(viewsets.ModelViewSet):
     """Вьюсет для отзывов."""
 
     serializer_class = ReviewSerializer
     permission_classes = (IsAdminOrModerOrAuthor,)
-    pagination_class = PageNumberPagination
+    pagination_class = PageNumberOrKeysetPagination
+    filter_backends = (DjangoFilterBackend, TieBreakOrderingFilter)
+    filterset_class = ReviewFilterSet
+    ordering_fields = ('score', 'pub_date')
+    ordering = ('-pub_date', '-id')
+
+    def get_keyset_ordering(self):
+        """Ключ постраничного вывода совпадает с сортировкой запроса."""
+        return TieBreakOrderingFilter().get_ordering(
+            self.request, None, self
+        )
 
     def get_title(self):
-        """Получение произведений."""
-        return get_object_or_404(
-            Title,
-            id=self.kwargs.get('title_id')
-        )
+        """Получение произведения, один раз за запрос."""
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title.objects.only('id'),
+                id=self.kwargs.get('title_id')
+            )
+        return self._title
 
     def get_queryset(self):
-        """Переопределяем метод get_queryset."""
-        return self.get_title().reviews.all()
+        """
+        Отзывы произведения вместе с именем автора.
+        Существование произведения проверяется отдельно,
+        только если страница списка пуста.
+        """
+        return Review.objects.filter(
+            title_id=self.kwargs.get('title_id')
+        ).select_related('author').only(*REVIEW_FIELDS)
+
+    def list(self, request, *args, **kwargs):
+        """Список отзывов; для пустой страницы проверяет произведение."""
+        response = super().list(request, *args, **kwargs)
+        if not response.data['results']:
+            self.get_title()
+        return response
 
     def perform_create(self, serializer):
-        """Создание новый записи в базе данных."""
-        serializer.save(author=self.request.user, title=self.get_title())
+        """
+        Создание новой записи в базе данных.
+        Уникальность отзыва проверяется ограничением в базе данных,
+        что безопасно и при одновременных запросах.
+        """
+        try:
+            with transaction.atomic():
+                serializer.save(
+                    author=self.request.user, title=self.get_title()
+                )
+        except IntegrityError:
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Больше одного отзыва написать нельзя'
+                ]
+            })
 
 
 class CommentViewSet(viewsets.ModelViewSet):
@@ -173,18 +549,97 @@ class CommentViewSet(viewsets.ModelViewSet):
 
     serializer_class = CommentSerializer
     permission_classes = (IsAdminOrModerOrAuthor,)
+    pagination_class = PageNumberOrKeysetPagination
+    keyset_ordering = ('-pub_date', '-id')
 
     def get_review(self):
-        """Получение отзывов."""
-        return get_object_or_404(
-            Review,
-            id=self.kwargs.get('review_id')
-        )
+        """Получение отзыва произведения, один раз за запрос."""
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review.objects.only('id', 'title_id'),
+                id=self.kwargs.get('review_id'),
+                title_id=self.kwargs.get('title_id'),
+            )
+        return self._review
 
     def get_queryset(self):
-        """Переопределяем метод get_queryset."""
-        return self.get_review().comments.all()
+        """
+        Комментарии отзыва вместе с именем автора.
+        Принадлежность отзыва произведению проверяется
+        в том же запросе через соединение с таблицей отзывов.
+        """
+        return Comment.objects.filter(
+            review_id=self.kwargs.get('review_id'),
+            review__title_id=self.kwargs.get('title_id'),
+        ).select_related('author').only(*COMMENT_FIELDS)
+
+    def list(self, request, *args, **kwargs):
+        """
+        Список комментариев.
+        Отзыв запрашивается отдельно, только если страница пуста:
+        чтобы отличить отзыв без комментариев от неверной пары
+        произведение-отзыв.
+        """
+        response = super().list(request, *args, **kwargs)
+        if not response.data['results']:
+            self.get_review()
+        return response
 
     def perform_create(self, serializer):
-        """Создание новый записи в базе данных."""
-        serializer.save(author=self.request.user, review=self.get_review())
+        """
+        Создание новой записи в базе данных
+        в одной транзакции с обновлением счетчика комментариев.
+        """
+        with transaction.atomic():
+            serializer.save(
+                author=self.request.user, review=self.get_review()
+            )
+
+    def perform_destroy(self, instance):
+        """
+        Удаление записи из базы данных
+        в одной транзакции с обновлением счетчика комментариев.
+        """
+        with transaction.atomic():
+            instance.delete()
+
+
+class ChangesView(APIView):
+    """
+    Журнал изменений для инкрементальной синхронизации.
+    Возвращает id созданных, измененных и удаленных объектов
+    после токена since; новый токен передается в поле next.
+    """
+
+    def get(self, request):
+        """Изменения объектов после токена since."""
+        params = ChangesQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        since = params.validated_data['since']
+        limit = params.validated_data['limit']
+        changes = list(
+            Change.objects.filter(id__gt=since).order_by('id').values_list(
+                'id', 'model', 'object_id', 'action'
+            )[:limit + 1]
+        )
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        actions = {}
+        for _, model, object_id, change_action in changes:
+            first, _ = actions.get((model, object_id), (change_action, None))
+            actions[model, object_id] = (first, change_action)
+        data = {
+            'next': changes[-1][0] if changes else since,
+            'has_more': has_more,
+        }
+        for key in CHANGES_KEYS.values():
+            data[key] = {'created': [], 'updated': [], 'deleted': []}
+        for (model, object_id), (first, last) in sorted(actions.items()):
+            if last == 'deleted':
+                change_action = 'deleted'
+            elif first == 'created':
+                change_action = 'created'
+            else:
+                change_action = 'updated'
+            data[CHANGES_KEYS[model]][change_action].append(object_id)
+        return Response(data)
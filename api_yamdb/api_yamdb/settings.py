@@ -23,6 +23,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'rest_framework_simplejwt',
+    'rest_framework_simplejwt.token_blacklist',
     'api.apps.ApiConfig',
     'reviews.apps.ReviewsConfig',
     'rest_framework',
@@ -73,6 +74,40 @@ DATABASES = {
 }
 
 
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# How long serialized title details are cached. Writes invalidate them
+# only in the cache of the process that handled them, so with a
+# per-process cache other processes may serve a stale title until this
+# timeout. Use a shared cache (e.g. Redis or Memcached) when running more
+# than one worker.
+TITLE_CACHE_TIMEOUT = 60 * 15
+
+# How long catalog versions behind ETag/Last-Modified are cached in front
+# of the CatalogVersion table. With a per-process cache a write made in
+# another process is seen no later than this timeout; an expired version
+# is read back from the table, so unchanged data keeps its ETag.
+CATALOG_VERSION_CACHE_TIMEOUT = 60
+
+# How long a user's token version is cached. With a per-process cache
+# a role change reaches other processes no later than this timeout.
+TOKEN_VERSION_CACHE_TIMEOUT = 60
+
+# How often each process rebuilds its Bloom filter of revoked tokens
+# from the database, in seconds.
+TOKEN_REVOCATION_REFRESH_INTERVAL = 30
+
+# Number of virtual average-score reviews added to every title
+# when ranking titles by Bayesian average.
+TITLE_RANKING_PRIOR_WEIGHT = 10
+
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -113,17 +148,48 @@ STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.UserClaimsJWTAuthentication',
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    'DEFAULT_THROTTLE_CLASSES': (
+        'api.throttling.ReadWriteRateThrottle',
+    ),
+    'DEFAULT_THROTTLE_RATES': {
+        'signup': '10/min',
+        'token': '20/min',
+        'reads': '600/min',
+        'writes': '120/min',
+    },
 }
 
+# Storage of throttling counters. LocalThrottleStore keeps them in
+# process memory; api.throttling.SQLiteThrottleStore shares them between
+# worker processes on one host, e.g.
+# THROTTLE_STORE_OPTIONS = {'path': BASE_DIR / 'throttle.sqlite3'}.
+THROTTLE_STORE = 'api.throttling.LocalThrottleStore'
+THROTTLE_STORE_OPTIONS = {}
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': datetime.timedelta(days=1),
+    'REFRESH_TOKEN_LIFETIME': datetime.timedelta(days=30),
+    'ROTATE_REFRESH_TOKENS': True,
+    'BLACKLIST_AFTER_ROTATION': True,
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+
+# Outbox delivery (manage.py send_outbox): messages per batch, attempts
+# before giving up and the first retry delay in seconds, doubled
+# after every failed attempt.
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_DELAY = 60
+
+# How long a claimed batch stays reserved for the worker sending it, in
+# seconds. Messages of a worker that stopped mid-batch are sent again
+# after this timeout.
+OUTBOX_CLAIM_TIMEOUT = 300
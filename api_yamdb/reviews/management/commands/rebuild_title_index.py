@@ -0,0 +1,19 @@
+from django.core.management import BaseCommand
+
+from reviews.models import Title
+from reviews.search import fts_enabled, rebuild_index
+
+
+class Command(BaseCommand):
+    """Пересоздает полнотекстовый индекс произведений."""
+
+    def handle(self, *args, **options):
+        if not fts_enabled():
+            self.stdout.write(
+                'Полнотекстовый индекс поддерживается только для SQLite'
+            )
+            return
+        rebuild_index()
+        self.stdout.write(
+            f'Проиндексировано произведений: {Title.objects.count()}'
+        )
@@ -0,0 +1,24 @@
+from django.core.management import BaseCommand
+
+from reviews.models import Title
+from reviews.signals import recalculate_comments_count, recalculate_rating
+
+
+class Command(BaseCommand):
+    """
+    Пересчитывает по отзывам сумму и количество оценок произведений,
+    а по комментариям — количество комментариев отзывов.
+    Восстанавливает счетчики, если они разошлись с данными.
+    """
+
+    def handle(self, *args, **options):
+        title_ids = list(Title.objects.values_list('pk', flat=True))
+        for title_id in title_ids:
+            recalculate_rating(title_id)
+        self.stdout.write(
+            f'Рейтинг пересчитан для произведений: {len(title_ids)}'
+        )
+        count = recalculate_comments_count()
+        self.stdout.write(
+            f'Количество комментариев пересчитано для отзывов: {count}'
+        )
@@ -0,0 +1,14 @@
+from django.core.management import BaseCommand
+
+from reviews.ranking import refresh_ranking
+
+
+class Command(BaseCommand):
+    """
+    Пересчитывает рейтинг лучших произведений.
+    Предназначена для периодического запуска (например, из cron).
+    """
+
+    def handle(self, *args, **options):
+        count = refresh_ranking()
+        self.stdout.write(f'Рейтинг пересчитан для произведений: {count}')
@@ -0,0 +1,36 @@
+from time import sleep
+
+from django.core.management import BaseCommand
+
+from reviews.outbox import send_outbox
+
+
+class Command(BaseCommand):
+    """
+    Отправляет письма из очереди.
+    Без параметра --interval отправляет накопившиеся письма и завершается
+    (например, при запуске из cron), с ним работает как фоновый процесс.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Количество писем в одной пачке.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            help='Пауза в секундах между проверками очереди.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = send_outbox(options['batch_size'])
+            if sent or failed or not options['interval']:
+                self.stdout.write(
+                    f'Отправлено писем: {sent}, не отправлено: {failed}'
+                )
+            if not options['interval']:
+                return
+            sleep(options['interval'])
@@ -0,0 +1,37 @@
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_rating(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    totals = Review.objects.values('title_id').annotate(
+        score_sum=Sum('score'),
+        score_count=Count('id'),
+    )
+    for row in totals:
+        Title.objects.filter(pk=row['title_id']).update(
+            rating_sum=row['score_sum'],
+            rating_count=row['score_count'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество оценок'),
+        ),
+        migrations.RunPython(fill_rating, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from reviews.search import drop_index, rebuild_index
+
+
+def create_title_index(apps, schema_editor):
+    rebuild_index(schema_editor.connection)
+
+
+def drop_title_index(apps, schema_editor):
+    drop_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_title_index, drop_title_index),
+    ]
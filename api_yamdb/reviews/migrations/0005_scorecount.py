@@ -0,0 +1,48 @@
+import django.core.validators
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def fill_score_counts(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    ScoreCount = apps.get_model('reviews', 'ScoreCount')
+    totals = Review.objects.values('title_id', 'score').annotate(
+        score_count=Count('id'),
+    )
+    ScoreCount.objects.bulk_create(
+        ScoreCount(
+            title_id=row['title_id'],
+            score=row['score'],
+            count=row['score_count'],
+        )
+        for row in totals
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_title_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.IntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(10)], verbose_name='оценка')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='score_counts', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Количество оценок',
+                'verbose_name_plural': 'Количество оценок',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='scorecount',
+            constraint=models.UniqueConstraint(fields=('title', 'score'), name='unique score count'),
+        ),
+        migrations.RunPython(fill_score_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_comments_count(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Comment = apps.get_model('reviews', 'Comment')
+    totals = Comment.objects.values('review_id').annotate(
+        total=Count('id'),
+    )
+    for row in totals:
+        Review.objects.filter(pk=row['review_id']).update(
+            comments_count=row['total'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_titleranking'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество комментариев'),
+        ),
+        migrations.RunPython(fill_comments_count, migrations.RunPython.noop),
+    ]
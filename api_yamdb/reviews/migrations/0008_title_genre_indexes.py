@@ -0,0 +1,34 @@
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_genre_titles(apps, schema_editor):
+    GenreTitle = apps.get_model('reviews', 'GenreTitle')
+    duplicates = GenreTitle.objects.values('genre_id', 'title_id').annotate(
+        first_id=Min('id'),
+        total=Count('id'),
+    ).filter(total__gt=1)
+    for row in duplicates:
+        GenreTitle.objects.filter(
+            genre_id=row['genre_id'],
+            title_id=row['title_id'],
+        ).exclude(pk=row['first_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_review_comments_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', 'year'], name='title_category_year_idx'),
+        ),
+        migrations.RunPython(remove_duplicate_genre_titles, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='genretitle',
+            constraint=models.UniqueConstraint(fields=('genre', 'title'), name='unique genre title'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0013_outboxemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TokenRevocation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_id', models.PositiveBigIntegerField(unique=True, verbose_name='ID пользователя')),
+                ('revoked_at', models.DateTimeField(verbose_name='Дата отзыва')),
+            ],
+            options={
+                'verbose_name': 'Отзыв токенов',
+                'verbose_name_plural': 'Отзывы токенов',
+            },
+        ),
+    ]
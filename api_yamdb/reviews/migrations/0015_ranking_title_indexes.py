@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0014_tokenrevocation'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='titleranking',
+            name='ranking_genre_score_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='titleranking',
+            name='ranking_category_score_idx',
+        ),
+        migrations.AddIndex(
+            model_name='titleranking',
+            index=models.Index(fields=['genre', '-score', 'title'], name='ranking_genre_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='titleranking',
+            index=models.Index(fields=['category', 'genre', '-score', 'title'], name='ranking_category_score_idx'),
+        ),
+    ]
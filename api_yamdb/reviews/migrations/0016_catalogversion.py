@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0015_ranking_title_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=50, unique=True, verbose_name='Набор данных')),
+                ('version', models.FloatField(verbose_name='Время изменения')),
+            ],
+            options={
+                'verbose_name': 'Версия набора данных',
+                'verbose_name_plural': 'Версии наборов данных',
+            },
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0016_catalogversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxemail',
+            name='claim',
+            field=models.CharField(blank=True, db_index=True, max_length=32, verbose_name='Метка отправки'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from datetime import datetime
 
 from django.db import models
+from django.utils import timezone
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.contrib.auth.models import AbstractUser
 
@@ -15,6 +16,10 @@ MAX_LENGTH_DESCRIPTION = 2000
 MAX_LENGTH_ROLE = 15
 MIN_SCORE = 1
 MAX_SCORE = 10
+MAX_LENGTH_CHANGE_FIELD = 10
+MAX_LENGTH_SUBJECT = 255
+MAX_LENGTH_SCOPE = 50
+MAX_LENGTH_CLAIM = 32
 
 ROLE_CHOICES = [
     ('user', 'Пользователь'),
@@ -22,10 +27,53 @@ ROLE_CHOICES = [
     ('admin', 'Администратор'),
 ]
 
+CHANGE_MODEL_CHOICES = [
+    ('title', 'Произведение'),
+    ('review', 'Отзыв'),
+    ('comment', 'Комментарий'),
+]
+
+CHANGE_ACTION_CHOICES = [
+    ('created', 'Создан'),
+    ('updated', 'Изменен'),
+    ('deleted', 'Удален'),
+]
+
 
-class User(AbstractUser):
+class CounterFieldsMixin:
+    """
+    Не перезаписывает счетчики при сохранении измененного объекта.
+    Поля из counter_fields меняются только запросами UPDATE с F-выражениями,
+    поэтому значения, загруженные вместе с объектом, могут устареть:
+    сохранение их обратно потеряло бы изменения, внесенные после загрузки.
+    """
+
+    counter_fields = ()
+
+    def save(self, force_insert=False, force_update=False, using=None,
+             update_fields=None):
+        if not self._state.adding and not force_insert:
+            if update_fields is None:
+                deferred = self.get_deferred_fields()
+                update_fields = [
+                    field.name for field in self._meta.concrete_fields
+                    if not field.primary_key
+                    and field.attname not in deferred
+                ]
+            update_fields = [
+                name for name in update_fields
+                if name not in self.counter_fields
+            ]
+        super().save(force_insert, force_update, using, update_fields)
+
+
+class User(CounterFieldsMixin, AbstractUser):
     """Модель пользователя."""
 
+    # Поля, которые попадают в токен: их изменение отзывает токены.
+    claim_fields = ('username', 'role', 'is_superuser', 'is_active')
+    counter_fields = ('token_version',)
+
     bio = models.TextField(
         verbose_name='Биография',
         blank=True
@@ -46,6 +94,11 @@ class User(AbstractUser):
         choices=ROLE_CHOICES,
         default='user',
     )
+    token_version = models.PositiveIntegerField(
+        verbose_name='Версия токенов',
+        default=0,
+        editable=False,
+    )
 
     class Meta:
         verbose_name = 'Пользователь'
@@ -54,6 +107,22 @@ class User(AbstractUser):
     def __str__(self):
         return self.username
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает значения полей токена, загруженные из базы данных."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_claims = instance.get_claims()
+        return instance
+
+    def get_claims(self):
+        """
+        Словарь значений полей, которые попадают в токен,
+        или None, если загружены не все из них.
+        """
+        if any(name not in self.__dict__ for name in self.claim_fields):
+            return None
+        return {name: self.__dict__[name] for name in self.claim_fields}
+
     @property
     def is_admin(self):
         """
@@ -110,9 +179,11 @@ class Genre(models.Model):
         return self.name[:LEN_STR_TEXT]
 
 
-class Title(models.Model):
+class Title(CounterFieldsMixin, models.Model):
     """Модель произведений."""
 
+    counter_fields = ('rating_sum', 'rating_count')
+
     name = models.CharField(
         max_length=MAX_LENGTH_NAME,
         verbose_name="Название произведения",
@@ -146,14 +217,37 @@ class Title(models.Model):
         through='GenreTitle',
         verbose_name="Жанры произведения",
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Сумма оценок",
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Количество оценок",
+    )
 
     class Meta:
         verbose_name = 'Категория'
         verbose_name_plural = 'Категории'
+        indexes = [
+            models.Index(
+                fields=('category', 'year'),
+                name='title_category_year_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name[:LEN_STR_TEXT]
 
+    @property
+    def rating(self):
+        """Средняя оценка произведения или None, если отзывов нет."""
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
 
 class GenreTitle(models.Model):
     """Промежуточная модель GenreTitle."""
@@ -172,10 +266,99 @@ class GenreTitle(models.Model):
     class Meta:
         verbose_name = 'Жанр и произведение'
         verbose_name_plural = 'Жанры и произведения'
+        constraints = [
+            models.UniqueConstraint(
+                fields=('genre', 'title',),
+                name='unique genre title'
+            )]
+
+
+class ScoreCount(models.Model):
+    """Количество отзывов с определенной оценкой у произведения."""
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='score_counts',
+        verbose_name="Произведение",
+    )
+    score = models.IntegerField(
+        'оценка',
+        validators=(
+            MinValueValidator(MIN_SCORE),
+            MaxValueValidator(MAX_SCORE)
+        ),
+    )
+    count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Количество отзывов",
+    )
+
+    class Meta:
+        verbose_name = 'Количество оценок'
+        verbose_name_plural = 'Количество оценок'
+        constraints = [
+            models.UniqueConstraint(
+                fields=('title', 'score',),
+                name='unique score count'
+            )]
+
+    def __str__(self):
+        return f'{self.title_id}: {self.score} - {self.count}'
+
+
+class TitleRanking(models.Model):
+    """
+    Материализованный рейтинг произведений по байесовскому среднему.
+    Для каждого произведения хранится общая запись (genre = NULL)
+    и по записи на каждый его жанр, чтобы выборка лучших произведений
+    с фильтром по жанру и категории шла по индексу.
+    """
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='rankings',
+        verbose_name="Произведение",
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.SET_NULL,
+        related_name='+',
+        null=True,
+        verbose_name="Категория",
+    )
+    genre = models.ForeignKey(
+        Genre,
+        on_delete=models.CASCADE,
+        related_name='+',
+        null=True,
+        verbose_name="Жанр",
+    )
+    score = models.FloatField(verbose_name="Байесовский рейтинг")
+
+    class Meta:
+        verbose_name = 'Рейтинг произведения'
+        verbose_name_plural = 'Рейтинг произведений'
+        indexes = [
+            models.Index(
+                fields=('genre', '-score', 'title'),
+                name='ranking_genre_score_idx'
+            ),
+            models.Index(
+                fields=('category', 'genre', '-score', 'title'),
+                name='ranking_category_score_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.title_id}: {self.score:.2f}'
 
 
-class Review(models.Model):
+class Review(CounterFieldsMixin, models.Model):
     """Модель отзывов."""
+
+    counter_fields = ('comments_count',)
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -200,6 +383,11 @@ class Review(models.Model):
                         f'Поставьте оценку от {MIN_SCORE} до {MAX_SCORE}!'
                         }
     )
+    comments_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False,
+    )
 
     class Meta:
         verbose_name = 'Отзыв'
@@ -209,10 +397,31 @@ class Review(models.Model):
                 fields=('title', 'author',),
                 name='unique review'
             )]
+        indexes = [
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx'
+            ),
+            models.Index(
+                fields=('author', 'pub_date', 'id'),
+                name='review_author_pub_date_idx'
+            ),
+            models.Index(
+                fields=('title', 'score', 'id'),
+                name='review_title_score_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.text[:LEN_STR_TEXT]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает оценку, загруженную из базы данных."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = instance.__dict__.get('score')
+        return instance
+
 
 class Comment(models.Model):
     """Модель комментриев."""
@@ -234,6 +443,128 @@ class Comment(models.Model):
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx'
+            ),
+            models.Index(
+                fields=('author', 'pub_date', 'id'),
+                name='comment_author_pub_date_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.text[:LEN_STR_TEXT]
+
+
+class Change(models.Model):
+    """
+    Журнал изменений произведений, отзывов и комментариев.
+    Записи только добавляются, id записи служит токеном синхронизации.
+    """
+
+    model = models.CharField(
+        max_length=MAX_LENGTH_CHANGE_FIELD,
+        choices=CHANGE_MODEL_CHOICES,
+        verbose_name='Модель',
+    )
+    object_id = models.PositiveBigIntegerField(verbose_name='ID объекта')
+    action = models.CharField(
+        max_length=MAX_LENGTH_CHANGE_FIELD,
+        choices=CHANGE_ACTION_CHOICES,
+        verbose_name='Действие',
+    )
+    created = models.DateTimeField('Дата изменения', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Изменение'
+        verbose_name_plural = 'Изменения'
+
+    def __str__(self):
+        return f'{self.id}: {self.model} {self.object_id} {self.action}'
+
+
+class OutboxEmail(models.Model):
+    """
+    Очередь исходящих писем.
+    Письма записываются в той же транзакции, что и изменения данных,
+    и отправляются командой send_outbox.
+    Перед отправкой процесс отмечает пачку писем своим claim
+    и откладывает следующую попытку, чтобы другие процессы
+    их не взяли. После успешной отправки письмо удаляется из очереди.
+    """
+
+    recipient = models.EmailField(verbose_name='Получатель')
+    subject = models.CharField(
+        max_length=MAX_LENGTH_SUBJECT,
+        verbose_name='Тема',
+    )
+    body = models.TextField(verbose_name='Текст')
+    created = models.DateTimeField('Дата создания', auto_now_add=True)
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Попытки отправки',
+        default=0,
+    )
+    next_attempt = models.DateTimeField(
+        verbose_name='Следующая попытка',
+        default=timezone.now,
+        null=True,
+        db_index=True,
+        help_text='Пусто, если попытки отправки исчерпаны.',
+    )
+    last_error = models.TextField(verbose_name='Последняя ошибка', blank=True)
+    claim = models.CharField(
+        verbose_name='Метка отправки',
+        max_length=MAX_LENGTH_CLAIM,
+        blank=True,
+        db_index=True,
+    )
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject[:LEN_STR_TEXT]}'
+
+
+class TokenRevocation(models.Model):
+    """
+    Отзыв токенов пользователя.
+    Отклоняются токены, выданные не позже даты отзыва.
+    """
+
+    user_id = models.PositiveBigIntegerField(
+        verbose_name='ID пользователя',
+        unique=True,
+    )
+    revoked_at = models.DateTimeField(verbose_name='Дата отзыва')
+
+    class Meta:
+        verbose_name = 'Отзыв токенов'
+        verbose_name_plural = 'Отзывы токенов'
+
+    def __str__(self):
+        return f'{self.user_id}: {self.revoked_at}'
+
+
+class CatalogVersion(models.Model):
+    """
+    Версия набора данных каталога для условных GET-запросов.
+    Версией служит время последнего изменения набора.
+    """
+
+    scope = models.CharField(
+        verbose_name='Набор данных',
+        max_length=MAX_LENGTH_SCOPE,
+        unique=True,
+    )
+    version = models.FloatField(verbose_name='Время изменения')
+
+    class Meta:
+        verbose_name = 'Версия набора данных'
+        verbose_name_plural = 'Версии наборов данных'
+
+    def __str__(self):
+        return f'{self.scope}: {self.version}'
@@ -0,0 +1,125 @@
+from datetime import timedelta
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+
+def queue_emails(emails):
+    """
+    Ставит в очередь письма (получатель, тема, текст) одним запросом.
+    Вызывается внутри транзакции, изменяющей данные,
+    поэтому письма сохраняются только вместе с ними.
+    """
+    OutboxEmail.objects.bulk_create(
+        OutboxEmail(recipient=recipient, subject=subject, body=message)
+        for recipient, subject, message in emails
+    )
+
+
+def get_retry_time(attempts):
+    """
+    Время следующей попытки отправки с экспоненциальной задержкой
+    или None, если попытки исчерпаны.
+    """
+    if attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+        return None
+    delay = settings.OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    return timezone.now() + timedelta(seconds=delay)
+
+
+def claim_batch(batch_size):
+    """
+    Забирает пачку писем, готовых к отправке.
+    Письма отмечаются меткой процесса, а следующая попытка откладывается
+    на OUTBOX_CLAIM_TIMEOUT секунд: другие процессы их не возьмут,
+    а если процесс завершится, не отправив их, письма вернутся в очередь.
+    """
+    while True:
+        now = timezone.now()
+        ids = list(
+            OutboxEmail.objects.filter(next_attempt__lte=now).order_by(
+                'next_attempt', 'id'
+            ).values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return []
+        claim = uuid4().hex
+        # Письма, которые успел забрать другой процесс, не обновятся.
+        claimed = OutboxEmail.objects.filter(
+            pk__in=ids, next_attempt__lte=now
+        ).update(
+            claim=claim,
+            next_attempt=now + timedelta(
+                seconds=settings.OUTBOX_CLAIM_TIMEOUT
+            ),
+        )
+        if claimed:
+            return list(
+                OutboxEmail.objects.filter(claim=claim).order_by('id')
+            )
+
+
+def send_batch(batch, connection):
+    """
+    Отправляет пачку писем. Отправленные письма удаляются,
+    для неотправленных по любой причине назначается повторная попытка.
+    Возвращает количество отправленных и неотправленных писем.
+    """
+    delivered = []
+    errors = []
+    try:
+        for email in batch:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.body,
+                to=[email.recipient],
+                connection=connection,
+            )
+            try:
+                message.send()
+            except Exception as error:
+                if isinstance(error, OSError):
+                    # Соединение могло оборваться: следующее письмо
+                    # откроет новое.
+                    connection.close()
+                email.attempts += 1
+                email.next_attempt = get_retry_time(email.attempts)
+                email.last_error = repr(error)
+                errors.append(email)
+            else:
+                delivered.append(email.pk)
+    finally:
+        # Итоги сохраняются, даже если отправка прервана:
+        # иначе доставленные письма ушли бы повторно.
+        OutboxEmail.objects.filter(pk__in=delivered).delete()
+        OutboxEmail.objects.bulk_update(
+            errors, ['attempts', 'next_attempt', 'last_error']
+        )
+    return len(delivered), len(errors)
+
+
+def send_outbox(batch_size=None, connection=None):
+    """
+    Отправляет письма из очереди пачками через одно соединение.
+    Соединение открывается, только если в очереди есть письма.
+    Несколько процессов могут отправлять письма одновременно:
+    каждый забирает свои пачки.
+    Возвращает количество отправленных и неотправленных писем.
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    batch = claim_batch(batch_size)
+    if not batch:
+        return 0, 0
+    sent = failed = 0
+    connection = connection or get_connection(fail_silently=False)
+    with connection:
+        while batch:
+            batch_sent, batch_failed = send_batch(batch, connection)
+            sent += batch_sent
+            failed += batch_failed
+            batch = claim_batch(batch_size)
+    return sent, failed
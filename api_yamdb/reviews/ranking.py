@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum
+
+from .models import GenreTitle, Title, TitleRanking
+
+
+def bayesian_score(rating_sum, rating_count, mean, weight):
+    """
+    Байесовское среднее: оценки произведения дополняются
+    weight «виртуальными» отзывами со средней оценкой по всем произведениям.
+    """
+    return (weight * mean + rating_sum) / (weight + rating_count)
+
+
+def refresh_ranking():
+    """Пересчитывает материализованный рейтинг всех произведений."""
+    totals = Title.objects.aggregate(
+        score_sum=Sum('rating_sum'),
+        score_count=Sum('rating_count'),
+    )
+    mean = (totals['score_sum'] or 0) / (totals['score_count'] or 1)
+    weight = settings.TITLE_RANKING_PRIOR_WEIGHT
+    titles = Title.objects.filter(rating_count__gt=0).values_list(
+        'id', 'category_id', 'rating_sum', 'rating_count'
+    )
+    genres = {}
+    for title_id, genre_id in GenreTitle.objects.filter(
+        title__rating_count__gt=0
+    ).values_list('title_id', 'genre_id'):
+        genres.setdefault(title_id, []).append(genre_id)
+
+    rankings = []
+    for title_id, category_id, rating_sum, rating_count in titles:
+        score = bayesian_score(rating_sum, rating_count, mean, weight)
+        for genre_id in [None, *genres.get(title_id, [])]:
+            rankings.append(TitleRanking(
+                title_id=title_id,
+                category_id=category_id,
+                genre_id=genre_id,
+                score=score,
+            ))
+    with transaction.atomic():
+        TitleRanking.objects.all().delete()
+        TitleRanking.objects.bulk_create(rankings, batch_size=500)
+    return len(titles)
@@ -0,0 +1,104 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+FTS_TABLE = 'reviews_title_fts'
+TITLE_TABLE = 'reviews_title'
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def fts_enabled(db_connection=connection):
+    """Полнотекстовый индекс поддерживается только для SQLite (FTS5)."""
+    return db_connection.vendor == 'sqlite'
+
+
+def create_index(db_connection=connection):
+    """Создает таблицу полнотекстового индекса произведений."""
+    if not fts_enabled(db_connection):
+        return
+    with db_connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} '
+            "USING fts5(name, description, prefix='2 3')"
+        )
+
+
+def drop_index(db_connection=connection):
+    """Удаляет таблицу полнотекстового индекса произведений."""
+    if not fts_enabled(db_connection):
+        return
+    with db_connection.cursor() as cursor:
+        cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def rebuild_index(db_connection=connection):
+    """Пересоздает полнотекстовый индекс по всем произведениям."""
+    if not fts_enabled(db_connection):
+        return
+    drop_index(db_connection)
+    create_index(db_connection)
+    with db_connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+            f"SELECT id, name, COALESCE(description, '') FROM {TITLE_TABLE}"
+        )
+
+
+def index_title(title):
+    """Добавляет или обновляет произведение в полнотекстовом индексе."""
+    if not fts_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [title.pk])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+            'VALUES (%s, %s, %s)',
+            [title.pk, title.name, title.description or ''],
+        )
+
+
+def unindex_title(title_id):
+    """Удаляет произведение из полнотекстового индекса."""
+    if not fts_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [title_id])
+
+
+def build_match_query(text):
+    """
+    Преобразует строку поиска в запрос FTS5.
+    Каждое слово экранируется как фраза и ищется по префиксу,
+    поэтому служебный синтаксис FTS5 в запросе пользователя не действует.
+    """
+    return ' '.join(
+        f'"{token}"*' for token in TOKEN_PATTERN.findall(text.lower())
+    )
+
+
+def search_titles(queryset, text):
+    """
+    Отбирает произведения по названию и описанию
+    и сортирует их по релевантности (bm25).
+    """
+    match_query = build_match_query(text)
+    if not match_query:
+        return queryset.none()
+    if not fts_enabled():
+        condition = Q()
+        for token in TOKEN_PATTERN.findall(text):
+            condition &= (
+                Q(name__icontains=token) | Q(description__icontains=token)
+            )
+        return queryset.filter(condition)
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[
+            f'{FTS_TABLE}.rowid = {TITLE_TABLE}.id',
+            f'{FTS_TABLE} MATCH %s',
+        ],
+        params=[match_query],
+        select={'search_rank': f'bm25({FTS_TABLE})'},
+        order_by=['search_rank', 'id'],
+    )
@@ -0,0 +1,164 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Change, Comment, Review, ScoreCount, Title
+from .search import index_title, unindex_title
+
+
+def recalculate_rating(title_id):
+    """
+    Пересчитывает сумму и количество оценок произведения,
+    а также распределение оценок по отзывам.
+    """
+    reviews = Review.objects.filter(title_id=title_id)
+    totals = reviews.aggregate(
+        score_sum=Sum('score'),
+        score_count=Count('id'),
+    )
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=totals['score_sum'] or 0,
+        rating_count=totals['score_count'],
+    )
+    with transaction.atomic():
+        ScoreCount.objects.filter(title_id=title_id).delete()
+        ScoreCount.objects.bulk_create(
+            ScoreCount(
+                title_id=title_id,
+                score=row['score'],
+                count=row['score_count'],
+            )
+            for row in reviews.values('score').annotate(
+                score_count=Count('id')
+            )
+        )
+
+
+def change_score_count(title_id, score, delta):
+    """Изменяет количество отзывов с оценкой score на delta."""
+    updated = ScoreCount.objects.filter(
+        title_id=title_id, score=score
+    ).update(count=F('count') + delta)
+    if updated or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            ScoreCount.objects.create(
+                title_id=title_id, score=score, count=delta
+            )
+    except IntegrityError:
+        ScoreCount.objects.filter(
+            title_id=title_id, score=score
+        ).update(count=F('count') + delta)
+
+
+def change_rating(title_id, score_delta, count_delta):
+    """Изменяет сумму и количество оценок произведения на заданные величины."""
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=F('rating_sum') + score_delta,
+        rating_count=F('rating_count') + count_delta,
+    )
+
+
+def log_changes(*changes):
+    """Добавляет записи (модель, id объекта, действие) в журнал изменений."""
+    Change.objects.bulk_create(
+        Change(model=model, object_id=object_id, action=action)
+        for model, object_id, action in changes
+    )
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    """Учитывает оценку созданного или измененного отзыва в рейтинге."""
+    if created:
+        change_rating(instance.title_id, instance.score, 1)
+        change_score_count(instance.title_id, instance.score, 1)
+    else:
+        loaded_score = getattr(instance, '_loaded_score', None)
+        if loaded_score is None:
+            recalculate_rating(instance.title_id)
+        elif loaded_score != instance.score:
+            change_rating(instance.title_id, instance.score - loaded_score, 0)
+            change_score_count(instance.title_id, loaded_score, -1)
+            change_score_count(instance.title_id, instance.score, 1)
+        else:
+            return
+    instance._loaded_score = instance.score
+    log_changes(('title', instance.title_id, 'updated'))
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """Исключает оценку удаленного отзыва из рейтинга."""
+    change_rating(instance.title_id, -instance.score, -1)
+    change_score_count(instance.title_id, instance.score, -1)
+    log_changes(('title', instance.title_id, 'updated'))
+
+
+def change_comments_count(review_id, delta):
+    """Изменяет количество комментариев отзыва на delta."""
+    Review.objects.filter(pk=review_id).update(
+        comments_count=F('comments_count') + delta
+    )
+
+
+def recalculate_comments_count():
+    """Пересчитывает количество комментариев всех отзывов."""
+    comments = Comment.objects.filter(
+        review=OuterRef('pk')
+    ).order_by().values('review').annotate(
+        count=Count('id')
+    ).values('count')
+    return Review.objects.update(
+        comments_count=Coalesce(Subquery(comments), 0)
+    )
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    """Учитывает новый комментарий в счетчике отзыва."""
+    if created:
+        change_comments_count(instance.review_id, 1)
+        log_changes(('review', instance.review_id, 'updated'))
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    """Исключает удаленный комментарий из счетчика отзыва."""
+    change_comments_count(instance.review_id, -1)
+    log_changes(('review', instance.review_id, 'updated'))
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, **kwargs):
+    """Обновляет произведение в полнотекстовом индексе."""
+    index_title(instance)
+
+
+@receiver(post_delete, sender=Title)
+def title_deleted(sender, instance, **kwargs):
+    """Удаляет произведение из полнотекстового индекса."""
+    unindex_title(instance.pk)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Review)
+@receiver(post_save, sender=Comment)
+def object_saved(sender, instance, created, **kwargs):
+    """Записывает создание или изменение объекта в журнал изменений."""
+    log_changes((
+        sender._meta.model_name,
+        instance.pk,
+        'created' if created else 'updated',
+    ))
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=Comment)
+def object_deleted(sender, instance, **kwargs):
+    """Записывает удаление объекта в журнал изменений."""
+    log_changes((sender._meta.model_name, instance.pk, 'deleted'))
@@ -1,6 +1,9 @@
 from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
 
+# Имена, совпадающие с адресами эндпоинтов /users/.
+RESERVED_USERNAMES = ('me', 'bulk')
+
 
 def validate_username(value):
     """Валидация имени пользователя."""
@@ -17,3 +20,5 @@ def validate_username(value):
         )
     )
     regex_validator(value)
+    if value in RESERVED_USERNAMES:
+        raise ValidationError(f'Имя "{value}" недоступно для применения.')
@@ -0,0 +1,15 @@
+import pytest
+from django.core.cache import cache
+
+from api.revocation import revocation_list
+from api.throttling import get_throttle_store
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    get_throttle_store().clear()
+    revocation_list.reset()
+    yield
+    cache.clear()
+    get_throttle_store().clear()
@@ -0,0 +1,80 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Review, Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def get_title(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == HTTPStatus.OK
+        return response.json()
+
+    def test_01_rating_follows_reviews(self, admin_client, user_client,
+                                       moderator_client, user):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+
+        create_single_review(user_client, title_id, 'Хорошо', 8)
+        review = create_single_review(
+            moderator_client, title_id, 'Плохо', 2
+        ).json()
+        assert self.get_title(admin_client, title_id)['rating'] == 5, (
+            'Проверьте, что рейтинг произведения пересчитывается '
+            'после создания отзыва.'
+        )
+
+        admin_client.patch(
+            f'/api/v1/titles/{title_id}/reviews/{review["id"]}/',
+            data={'score': 6}
+        )
+        assert self.get_title(admin_client, title_id)['rating'] == 7, (
+            'Проверьте, что рейтинг произведения пересчитывается '
+            'после изменения оценки в отзыве.'
+        )
+
+        admin_client.delete(
+            f'/api/v1/titles/{title_id}/reviews/{review["id"]}/'
+        )
+        assert self.get_title(admin_client, title_id)['rating'] == 8, (
+            'Проверьте, что рейтинг произведения пересчитывается '
+            'после удаления отзыва.'
+        )
+
+        user.delete()
+        assert self.get_title(admin_client, title_id)['rating'] is None, (
+            'Проверьте, что рейтинг произведения пересчитывается '
+            'после удаления автора отзыва.'
+        )
+
+    def test_02_title_save_keeps_rating(self, admin_client, user):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        title = Title.objects.get(pk=title_id)
+        Review.objects.create(
+            title_id=title_id, author=user, text='Отлично', score=9
+        )
+        title.name = 'Новое название'
+        title.save()
+        assert self.get_title(admin_client, title_id)['rating'] == 9, (
+            'Проверьте, что сохранение произведения не перезаписывает '
+            'счетчики оценок значениями, загруженными до появления отзыва.'
+        )
+
+        response = admin_client.patch(
+            f'/api/v1/titles/{title_id}/', data={'year': 1990}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_title(admin_client, title_id)['rating'] == 9
+
+        Title.objects.filter(pk=title_id).update(rating_sum=0, rating_count=0)
+        call_command('recalculate_counters')
+        assert self.get_title(admin_client, title_id)['rating'] == 9, (
+            'Проверьте, что команда recalculate_counters пересчитывает '
+            'рейтинг произведений по отзывам.'
+        )
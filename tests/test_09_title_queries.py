@@ -0,0 +1,140 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    def count_queries(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return len(context.captured_queries)
+
+    def add_titles(self, admin_client, genres, categories, count):
+        for number in range(count):
+            response = admin_client.post('/api/v1/titles/', data={
+                'name': f'Произведение {number}',
+                'year': 2000,
+                'genre': [genre['slug'] for genre in genres],
+                'category': categories[number % 2]['slug'],
+            })
+            assert response.status_code == HTTPStatus.CREATED
+
+    def test_01_title_list_queries_flat(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        url = '/api/v1/titles/'
+        queries_before = self.count_queries(client, url)
+
+        self.add_titles(admin_client, genres, categories, 6)
+        queries_after = self.count_queries(client, url)
+        assert queries_after == queries_before, (
+            f'Проверьте, что количество запросов к БД при GET-запросе к '
+            f'`{url}` не зависит от количества произведений на странице: '
+            f'было {queries_before}, стало {queries_after}.'
+        )
+
+    def test_02_title_detail_queries_flat(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        queries = {
+            self.count_queries(client, f'/api/v1/titles/{title["id"]}/')
+            for title in titles
+        }
+        assert len(queries) == 1 and queries.pop() <= 2, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/{titles_id}/` '
+            'выполняет не более двух запросов к БД.'
+        )
+
+    def test_03_title_batch_by_ids(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        self.add_titles(admin_client, genres, categories, 3)
+        url = '/api/v1/titles/'
+        ids = [titles[1]['id'], 100500, titles[0]['id']]
+        query = ','.join(str(pk) for pk in ids)
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, {'ids': query})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` с параметром `ids` '
+            'возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert [title['id'] for title in data['results']] == [
+            titles[1]['id'], titles[0]['id']
+        ], (
+            f'Проверьте, что GET-запрос к `{url}` с параметром `ids` '
+            'возвращает произведения в порядке запроса.'
+        )
+        assert data['missing'] == [100500], (
+            f'Проверьте, что GET-запрос к `{url}` с параметром `ids` '
+            'возвращает список ненайденных id.'
+        )
+        assert data['results'][0]['category'] == categories[1]
+        assert len(context.captured_queries) <= 2, (
+            f'Проверьте, что GET-запрос к `{url}` с параметром `ids` '
+            'выполняет не более двух запросов к БД.'
+        )
+
+        response = client.get(url, {'ids': '1,two'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = client.get(
+            url, {'ids': ','.join(str(pk) for pk in range(1, 202))}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_title_sparse_fields(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = '/api/v1/titles/'
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, {'fields': 'id,name,rating'})
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert {tuple(sorted(title)) for title in results} == {
+            ('id', 'name', 'rating')
+        }, (
+            f'Проверьте, что параметр `fields` эндпоинта `{url}` '
+            'оставляет в ответе только запрошенные поля.'
+        )
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        assert 'reviews_genre' not in sql and 'reviews_category' not in sql, (
+            f'Проверьте, что при GET-запросе к `{url}` без полей `genre` и '
+            '`category` жанры и категории не загружаются.'
+        )
+        assert '"description"' not in sql, (
+            f'Проверьте, что при GET-запросе к `{url}` без поля '
+            '`description` описание не загружается из БД.'
+        )
+
+        detail_url = f'{url}{titles[0]["id"]}/'
+        response = client.get(detail_url, {'fields': 'id,genre'})
+        assert set(response.json()) == {'id', 'genre'}
+        full = client.get(detail_url).json()
+        assert client.get(detail_url, {'fields': 'category'}).json() == {
+            'category': full['category']
+        }
+        response = client.get(url, {'fields': 'id'})
+        assert response.json()['results'] == [
+            {'id': title['id']} for title in titles
+        ]
+
+    def test_05_unknown_sparse_fields(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        client.get(title_url)
+        for url in (
+            '/api/v1/titles/',
+            title_url,
+            f'{title_url}reviews/',
+        ):
+            response = client.get(url, {'fields': 'id,unknown'})
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что GET-запрос к `{url}` с неизвестным полем '
+                'в параметре `fields` возвращает ответ со статусом 400.'
+            )
+            assert 'fields' in response.json()
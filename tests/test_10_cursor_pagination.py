@@ -0,0 +1,64 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews, create_single_comment
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    def test_01_comments_cursor(self, admin_client, admin, user_client):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        for number in range(12):
+            create_single_comment(
+                user_client, titles[0]['id'], reviews[0]['id'], f'c{number}'
+            )
+
+        response = admin_client.get(url, {'cursor': ''})
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert 'count' not in data, (
+            f'Проверьте, что при GET-запросе к `{url}` с параметром `cursor` '
+            'не подсчитывается общее количество объектов.'
+        )
+        first_page = [comment['text'] for comment in data['results']]
+        assert first_page == [f'c{number}' for number in range(11, 1, -1)], (
+            f'Проверьте, что при GET-запросе к `{url}` с параметром `cursor` '
+            'комментарии возвращаются от новых к старым.'
+        )
+        assert data['next'], (
+            f'Проверьте, что при GET-запросе к `{url}` с параметром `cursor` '
+            'возвращается ссылка на следующую страницу.'
+        )
+
+        create_single_comment(
+            user_client, titles[0]['id'], reviews[0]['id'], 'new'
+        )
+        response = admin_client.get(data['next'])
+        data = response.json()
+        assert [comment['text'] for comment in data['results']] == [
+            'c1', 'c0'
+        ], (
+            'Проверьте, что новые комментарии не сдвигают следующие '
+            'страницы при выводе по курсору.'
+        )
+        assert data['next'] is None
+
+    def test_02_invalid_cursor(self, client, admin_client, admin):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url, {'cursor': 'broken'})
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'Проверьте, что GET-запрос к `{url}` с некорректным курсором '
+            'возвращает ответ со статусом 404.'
+        )
+
+    def test_03_titles_cursor(self, client, admin_client):
+        response = client.get('/api/v1/titles/', {'cursor': ''})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {'next': None, 'results': []}
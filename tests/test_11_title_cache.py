@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.cache import title_cache
+from reviews.models import Category, Genre, GenreTitle
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleCache:
+
+    def get_title(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == HTTPStatus.OK
+        return response.json()
+
+    def test_01_cache_hit(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        title_cache.reset_stats()
+
+        first = self.get_title(client, titles[0]['id'])
+        with CaptureQueriesContext(connection) as context:
+            second = self.get_title(client, titles[0]['id'])
+        assert first == second
+        assert not context.captured_queries, (
+            f'Проверьте, что повторный GET-запрос к `{url}` '
+            'не обращается к базе данных.'
+        )
+        assert title_cache.stats() == {'hits': 1, 'misses': 1}
+
+    def test_02_cache_invalidation(self, client, admin_client, user_client):
+        titles, categories, genres = create_titles(admin_client)
+        title_id = titles[0]['id']
+        self.get_title(client, title_id)
+
+        create_single_review(user_client, title_id, 'Отлично', 9)
+        assert self.get_title(client, title_id)['rating'] == 9, (
+            'Проверьте, что кэш произведения сбрасывается '
+            'при добавлении отзыва.'
+        )
+
+        category = Category.objects.get(slug=categories[0]['slug'])
+        category.name = 'Кино'
+        category.save()
+        assert self.get_title(client, title_id)['category']['name'] == (
+            'Кино'
+        ), 'Проверьте, что кэш сбрасывается при изменении категории.'
+
+        genre = Genre.objects.get(slug=genres[0]['slug'])
+        genre.name = 'Хоррор'
+        genre.save()
+        title_genres = self.get_title(client, title_id)['genre']
+        assert {'name': 'Хоррор', 'slug': genre.slug} in title_genres, (
+            'Проверьте, что кэш сбрасывается при изменении жанра.'
+        )
+
+        GenreTitle.objects.filter(title_id=title_id).delete()
+        assert self.get_title(client, title_id)['genre'] == [], (
+            'Проверьте, что кэш сбрасывается при изменении '
+            'жанров произведения.'
+        )
+
+        category.delete()
+        assert self.get_title(client, title_id)['category'] is None, (
+            'Проверьте, что кэш сбрасывается при удалении категории.'
+        )
+
+        admin_client.delete(f'/api/v1/titles/{title_id}/')
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,61 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Title
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitleSearch:
+
+    url = '/api/v1/titles/'
+
+    def search(self, client, query):
+        response = client.get(self.url, {'q': query})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.url}` с параметром `q` '
+            'возвращает ответ со статусом 200.'
+        )
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_name_and_description(self, client, admin_client):
+        create_titles(admin_client)
+        assert self.search(client, 'терминат') == ['Терминатор'], (
+            f'Проверьте, что параметр `q` эндпоинта `{self.url}` ищет '
+            'произведения по началу слова в названии.'
+        )
+        assert self.search(client, 'yippie') == ['Крепкий орешек'], (
+            f'Проверьте, что параметр `q` эндпоинта `{self.url}` ищет '
+            'произведения по описанию.'
+        )
+        assert self.search(client, '"OR* NEAR(') == [], (
+            f'Проверьте, что синтаксис FTS5 в параметре `q` эндпоинта '
+            f'`{self.url}` не приводит к ошибке.'
+        )
+
+    def test_02_search_ranking_and_sync(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(
+            f'{self.url}{titles[1]["id"]}/',
+            data={'description': 'back to back back'}
+        )
+        assert self.search(client, 'back') == [
+            'Крепкий орешек', 'Терминатор'
+        ], (
+            f'Проверьте, что результаты поиска на `{self.url}` '
+            'упорядочены по релевантности.'
+        )
+        admin_client.delete(f'{self.url}{titles[1]["id"]}/')
+        assert self.search(client, 'back') == ['Терминатор']
+
+    def test_03_rebuild_index(self, client, admin_client):
+        create_titles(admin_client)
+        Title.objects.filter(name='Терминатор').update(name='Чужой')
+        call_command('rebuild_title_index')
+        assert self.search(client, 'чужой') == ['Чужой'], (
+            'Проверьте, что команда `rebuild_title_index` '
+            'пересоздает полнотекстовый индекс.'
+        )
+        assert self.search(client, 'терминатор') == []
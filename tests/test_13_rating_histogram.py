@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13RatingHistogram:
+
+    url = '/api/v1/titles/{title_id}/rating-histogram/'
+
+    def get_histogram(self, client, title_id):
+        response = client.get(self.url.format(title_id=title_id))
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.url}` возвращает ответ '
+            'со статусом 200.'
+        )
+        data = response.json()
+        return {
+            item['score']: item['count'] for item in data['histogram']
+        }, data['count']
+
+    def test_01_histogram_follows_reviews(self, client, admin_client,
+                                          user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+
+        histogram, count = self.get_histogram(client, title_id)
+        assert count == 0 and list(histogram) == list(range(1, 11)), (
+            f'Проверьте, что ответ на GET-запрос к `{self.url}` содержит '
+            'количество отзывов для каждой оценки от 1 до 10.'
+        )
+
+        create_single_review(user_client, title_id, 'Так себе', 4)
+        review = create_single_review(
+            moderator_client, title_id, 'Отлично', 10
+        ).json()
+        histogram, count = self.get_histogram(client, title_id)
+        assert count == 2 and histogram[4] == 1 and histogram[10] == 1, (
+            f'Проверьте, что `{self.url}` учитывает созданные отзывы.'
+        )
+
+        review_url = f'/api/v1/titles/{title_id}/reviews/{review["id"]}/'
+        moderator_client.patch(review_url, data={'score': 4})
+        histogram, count = self.get_histogram(client, title_id)
+        assert count == 2 and histogram[4] == 2 and histogram[10] == 0, (
+            f'Проверьте, что `{self.url}` учитывает изменение оценки.'
+        )
+
+        moderator_client.delete(review_url)
+        histogram, count = self.get_histogram(client, title_id)
+        assert count == 1 and histogram[4] == 1, (
+            f'Проверьте, что `{self.url}` учитывает удаление отзыва.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            self.get_histogram(client, title_id)
+        assert not any(
+            'reviews_review' in query['sql']
+            for query in context.captured_queries
+        ), f'Проверьте, что `{self.url}` не читает таблицу отзывов.'
+
+    def test_02_histogram_not_found(self, client):
+        response = client.get(self.url.format(title_id=100500))
+        assert response.status_code == HTTPStatus.NOT_FOUND
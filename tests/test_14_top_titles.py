@@ -0,0 +1,90 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TopTitles:
+
+    url = '/api/v1/titles/top/'
+
+    def get_top(self, client, **params):
+        response = client.get(self.url, params)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.url}` возвращает ответ '
+            'со статусом 200.'
+        )
+        return [title['name'] for title in response.json()]
+
+    def test_01_bayesian_ranking(self, client, admin_client, user_client,
+                                 moderator_client, admin):
+        titles, categories, genres = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Хорошо', 9)
+        create_single_review(moderator_client, titles[0]['id'], 'Хорошо', 9)
+        create_single_review(admin_client, titles[0]['id'], 'Хорошо', 8)
+        create_single_review(user_client, titles[1]['id'], 'Шедевр', 10)
+        create_single_review(moderator_client, titles[1]['id'], 'Плохо', 1)
+        admin_client.post('/api/v1/titles/', data={
+            'name': 'Новинка',
+            'year': 2020,
+            'genre': [genres[0]['slug']],
+            'category': categories[0]['slug'],
+        })
+
+        assert self.get_top(client) == [], (
+            f'Проверьте, что `{self.url}` читает материализованный рейтинг.'
+        )
+        call_command('refresh_title_ranking')
+
+        assert self.get_top(client) == ['Терминатор', 'Крепкий орешек'], (
+            f'Проверьте, что `{self.url}` упорядочивает произведения по '
+            'байесовскому среднему и не включает произведения без отзывов.'
+        )
+        assert self.get_top(client, limit=1) == ['Терминатор']
+        assert self.get_top(client, genre=genres[2]['slug']) == [
+            'Крепкий орешек'
+        ]
+        assert self.get_top(
+            client, category=categories[0]['slug'], genre=genres[0]['slug']
+        ) == ['Терминатор']
+        assert self.get_top(client, category=categories[1]['slug']) == [
+            'Крепкий орешек'
+        ]
+
+    def test_02_invalid_limit(self, client):
+        response = client.get(self.url, {'limit': 1000})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что GET-запрос к `{self.url}` со слишком большим '
+            '`limit` возвращает ответ со статусом 400.'
+        )
+
+    def test_03_top_uses_index(self, client, admin_client, user_client):
+        titles, categories, genres = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Хорошо', 9)
+        call_command('refresh_title_ranking')
+        for params in (
+            {},
+            {'genre': genres[0]['slug']},
+            {'category': categories[0]['slug'], 'genre': genres[0]['slug']},
+        ):
+            with CaptureQueriesContext(connection) as context:
+                self.get_top(client, **params)
+            ranking_sql = next(
+                query['sql'] for query in context.captured_queries
+                if 'reviews_titleranking' in query['sql']
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {ranking_sql}')
+                plan = [row[3] for row in cursor.fetchall()]
+            assert not any(
+                step.startswith('SCAN') or 'TEMP B-TREE' in step
+                for step in plan
+            ), (
+                f'Проверьте, что `{self.url}` с параметрами {params} '
+                f'читает рейтинг по индексу. План запроса: {plan}'
+            )
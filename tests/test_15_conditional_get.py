@@ -0,0 +1,102 @@
+from http import HTTPStatus
+from time import sleep
+
+import pytest
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import CatalogVersion
+from tests.utils import (create_categories, create_genre,
+                         create_single_review, create_titles)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ConditionalGet:
+
+    def check_not_modified(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response['ETag']
+        assert etag and response['Last-Modified'], (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовки `ETag` и `Last-Modified`.'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        assert not context.captured_queries, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` не обращается к базе данных.'
+        )
+        return etag
+
+    def test_01_catalog_lists(self, client, admin_client):
+        for url, create in (
+            ('/api/v1/categories/', create_categories),
+            ('/api/v1/genres/', create_genre),
+        ):
+            etag = self.check_not_modified(client, url)
+            create(admin_client)
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что после изменения данных GET-запрос к `{url}` '
+                'со старым `If-None-Match` возвращает ответ со статусом 200.'
+            )
+            response = client.get(
+                url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+            )
+            assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_02_titles(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        list_url = '/api/v1/titles/'
+        detail_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        other_url = f'/api/v1/titles/{titles[1]["id"]}/'
+        list_etag = self.check_not_modified(client, list_url)
+        detail_etag = self.check_not_modified(client, detail_url)
+        other_etag = self.check_not_modified(client, other_url)
+        response = client.get(
+            list_url, {'year': 1984}, HTTP_IF_NONE_MATCH=list_etag
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что `ETag` списка произведений зависит '
+            'от параметров запроса.'
+        )
+
+        create_single_review(user_client, titles[0]['id'], 'Отлично', 10)
+        for url, etag in ((list_url, list_etag), (detail_url, detail_etag)):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что после добавления отзыва GET-запрос к `{url}` '
+                'со старым `If-None-Match` возвращает ответ со статусом 200.'
+            )
+        response = client.get(other_url, HTTP_IF_NONE_MATCH=other_etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_03_versions_survive_cache_expiry(self, settings, client,
+                                              admin_client):
+        settings.CATALOG_VERSION_CACHE_TIMEOUT = 1
+        url = '/api/v1/categories/'
+        create_categories(admin_client)
+        etag = self.check_not_modified(client, url)
+        sleep(settings.CATALOG_VERSION_CACHE_TIMEOUT + 0.1)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что версии наборов данных хранятся в базе данных '
+            'и не меняются, пока данные не изменились.'
+        )
+
+        # Запись в другом процессе меняет версию только в базе данных.
+        CatalogVersion.objects.filter(scope='categories').update(
+            version=F('version') + 1
+        )
+        sleep(settings.CATALOG_VERSION_CACHE_TIMEOUT + 0.1)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что версии наборов данных хранятся в кэше '
+            'ограниченное время.'
+        )
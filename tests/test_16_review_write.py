@@ -0,0 +1,58 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16ReviewWrite:
+
+    def test_01_review_create_queries(self, admin_client, user_client, user):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={'text': 'Да', 'score': 7})
+        assert response.status_code == HTTPStatus.CREATED
+        title_queries = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_title"' in query['sql']
+        ]
+        assert len(title_queries) == 1, (
+            f'Проверьте, что при POST-запросе к `{url}` произведение '
+            'запрашивается из БД только один раз.'
+        )
+        assert not any(
+            'FROM "reviews_review"' in query['sql']
+            for query in context.captured_queries
+        ), (
+            f'Проверьте, что при POST-запросе к `{url}` уникальность '
+            'отзыва проверяется ограничением БД, а не отдельным запросом.'
+        )
+
+    def test_02_duplicate_review(self, admin_client, user_client, user):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        Review.objects.create(
+            title_id=titles[0]['id'], author=user, text='Первый', score=5
+        )
+        response = user_client.post(url, data={'text': 'Второй', 'score': 9})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что повторный POST-запрос к `{url}` возвращает '
+            'ответ со статусом 400.'
+        )
+        assert Review.objects.filter(author=user).count() == 1
+        response = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.json()['rating'] == 5, (
+            'Проверьте, что отклоненный отзыв не влияет на рейтинг.'
+        )
+
+        response = user_client.post(
+            '/api/v1/titles/100500/reviews/', data={'text': 'Да', 'score': 7}
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
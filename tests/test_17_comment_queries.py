@@ -0,0 +1,126 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.views import REVIEW_FIELDS
+from reviews.models import Comment, Review
+from tests.utils import create_comments, create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17CommentQueries:
+
+    def test_01_mismatched_title_and_review(self, client, admin_client,
+                                            admin, user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        wrong_url = (
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        for url in (wrong_url, f'{wrong_url}{comments[0]["id"]}/'):
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                'Проверьте, что GET-запрос к `/api/v1/titles/{title_id}/'
+                'reviews/{review_id}/comments/` с отзывом другого '
+                'произведения возвращает ответ со статусом 404.'
+            )
+        response = user_client.post(wrong_url, data={'text': 'Мимо'})
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_empty_comment_list(self, client, admin_client, admin):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['results'] == []
+
+    def count_queries(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return len(context.captured_queries)
+
+    def test_03_review_and_comment_lists_queries(self, client, admin_client,
+                                                 admin, user_client, user,
+                                                 moderator_client, moderator):
+        authors_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client,
+        }
+        comments, reviews, titles = create_comments(admin_client, authors_map)
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        for url in (reviews_url, comments_url):
+            for params in ('', '?cursor='):
+                queries = self.count_queries(client, url + params)
+                expected = 1 if params else 2
+                assert queries == expected, (
+                    f'Проверьте, что GET-запрос к `{url}{params}` выполняет '
+                    f'{expected} запрос(а) к БД независимо от количества '
+                    f'объектов на странице, сейчас: {queries}.'
+                )
+        response = client.get(comments_url)
+        assert response.json()['results'][0]['review'] == reviews[0]['id']
+
+        detail_urls = (
+            f'{reviews_url}{reviews[0]["id"]}/',
+            f'{comments_url}{comments[0]["id"]}/',
+        )
+        for url in detail_urls:
+            assert self.count_queries(client, url) == 1, (
+                f'Проверьте, что GET-запрос к `{url}` выполняет один запрос '
+                'к БД.'
+            )
+
+    def test_04_review_comments_count(self, client, admin_client, admin,
+                                      user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        assert client.get(url).json()['comments_count'] == 2, (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'количество комментариев к отзыву в поле `comments_count`.'
+        )
+        user_client.delete(f'{url}comments/{comments[1]["id"]}/')
+        assert client.get(url).json()['comments_count'] == 1, (
+            'Проверьте, что `comments_count` уменьшается после удаления '
+            'комментария.'
+        )
+        user.delete()
+        assert client.get(url).json()['comments_count'] == 1
+        admin.delete()
+        response = client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/')
+        assert response.json()['results'] == []
+
+    def test_05_review_save_keeps_comments_count(self, client, admin_client,
+                                                 admin, user_client, user):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        review = Review.objects.only(*REVIEW_FIELDS).get(pk=reviews[0]['id'])
+        Comment.objects.create(review=review, author=user, text='Согласен')
+        review.text = 'Новый текст'
+        review.save()
+        assert client.get(url).json()['comments_count'] == 3, (
+            'Проверьте, что сохранение отзыва не перезаписывает '
+            '`comments_count` значением, загруженным до появления '
+            'комментария.'
+        )
+
+        Review.objects.update(comments_count=0)
+        call_command('recalculate_counters')
+        assert client.get(url).json()['comments_count'] == 3, (
+            'Проверьте, что команда recalculate_counters пересчитывает '
+            'количество комментариев отзывов.'
+        )
@@ -0,0 +1,64 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Genre, GenreTitle, Title
+from tests.utils import create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18QueryPlans:
+
+    def get_plans(self, client, url, params=None):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK
+        plans = []
+        with connection.cursor() as cursor:
+            for query in context.captured_queries:
+                if not query['sql'].startswith('SELECT'):
+                    continue
+                cursor.execute(f'EXPLAIN QUERY PLAN {query["sql"]}')
+                plans.append([row[3] for row in cursor.fetchall()])
+        return plans
+
+    def check_no_full_scan(self, client, url, params=None):
+        for plan in self.get_plans(client, url, params):
+            scans = [
+                step for step in plan
+                if step.startswith('SCAN') or 'TEMP B-TREE' in step
+            ]
+            assert not scans, (
+                f'Проверьте, что GET-запрос к `{url}` с параметрами {params} '
+                f'использует индексы. План запроса: {plan}'
+            )
+
+    def test_01_list_queries_use_indexes(self, client, admin_client, admin,
+                                         user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        titles_url = '/api/v1/titles/'
+        for params in (
+            {'category': 'films'},
+            {'category': 'films', 'year': 1984},
+            {'genre': 'horror'},
+        ):
+            self.check_no_full_scan(client, titles_url, params)
+
+        reviews_url = f'/api/v1/titles/{title_id}/reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        for url in (reviews_url, comments_url):
+            self.check_no_full_scan(client, url)
+            self.check_no_full_scan(client, url, {'cursor': ''})
+
+    def test_02_genre_title_unique(self, admin_client):
+        titles, _, genres = create_titles(admin_client)
+        title = Title.objects.get(pk=titles[0]['id'])
+        genre = Genre.objects.get(slug=genres[0]['slug'])
+        with pytest.raises(IntegrityError):
+            with transaction.atomic():
+                GenreTitle.objects.create(title=title, genre=genre)
@@ -0,0 +1,81 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19UserActivity:
+
+    def test_01_me_feeds(self, client, admin_client, admin, user_client,
+                         user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        create_single_review(user_client, titles[1]['id'], 'Второй', 3)
+
+        url = '/api/v1/users/me/reviews/'
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        response = user_client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос пользователя к `{url}` возвращает '
+            'ответ со статусом 200.'
+        )
+        data = response.json()
+        assert [review['text'] for review in data['results']] == [
+            'Второй', 'review number 2'
+        ], (
+            f'Проверьте, что `{url}` возвращает отзывы пользователя '
+            'от новых к старым.'
+        )
+        assert data['next'] is None and 'count' not in data
+
+        url = '/api/v1/users/me/comments/'
+        response = user_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert [
+            comment['id'] for comment in response.json()['results']
+        ] == [comments[1]['id']], (
+            f'Проверьте, что `{url}` возвращает комментарии пользователя.'
+        )
+
+    def test_02_admin_feeds(self, admin_client, admin, user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        for feed in ('reviews', 'comments'):
+            url = f'/api/v1/users/{user.username}/{feed}/'
+            response = user_client.get(url)
+            assert response.status_code == HTTPStatus.FORBIDDEN, (
+                f'Проверьте, что GET-запрос пользователя к `{url}` '
+                'возвращает ответ со статусом 403.'
+            )
+            response = admin_client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что GET-запрос администратора к `{url}` '
+                'возвращает ответ со статусом 200.'
+            )
+            assert {
+                item['author'] for item in response.json()['results']
+            } == {user.username}
+        response = admin_client.get('/api/v1/users/nobody/reviews/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_feed_uses_index(self, user_client, user, admin_client,
+                                admin):
+        create_comments(admin_client, {admin: admin_client, user: user_client})
+        with CaptureQueriesContext(connection) as context:
+            user_client.get('/api/v1/users/me/reviews/')
+        with connection.cursor() as cursor:
+            for query in context.captured_queries:
+                if 'FROM "reviews_review"' not in query['sql']:
+                    continue
+                cursor.execute(f'EXPLAIN QUERY PLAN {query["sql"]}')
+                plan = [row[3] for row in cursor.fetchall()]
+                assert any(
+                    'review_author_pub_date_idx' in step for step in plan
+                ), f'Лента отзывов должна читаться по индексу: {plan}'
+                assert not any('TEMP B-TREE' in step for step in plan)
@@ -0,0 +1,107 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import (
+    create_single_comment,
+    create_single_review,
+    create_titles,
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20ChangesFeed:
+
+    url = '/api/v1/changes/'
+
+    def get_changes(self, client, **params):
+        response = client.get(self.url, params)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.url}` возвращает ответ '
+            'со статусом 200.'
+        )
+        return response.json()
+
+    def test_01_initial_sync(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        review = create_single_review(
+            user_client, titles[0]['id'], 'Хорошо', 8
+        ).json()
+        comment = create_single_comment(
+            user_client, titles[0]['id'], review['id'], 'Согласен'
+        ).json()
+
+        data = self.get_changes(client)
+        assert data['titles']['created'] == [
+            title['id'] for title in titles
+        ], (
+            f'Проверьте, что `{self.url}` возвращает id созданных '
+            'произведений.'
+        )
+        assert data['titles']['updated'] == [], (
+            f'Проверьте, что `{self.url}` не дублирует созданные в окне '
+            'синхронизации объекты в списке измененных.'
+        )
+        assert data['reviews']['created'] == [review['id']]
+        assert data['comments']['created'] == [comment['id']]
+        assert data['has_more'] is False
+
+        assert self.get_changes(client, since=data['next']) == {
+            'next': data['next'],
+            'has_more': False,
+            'titles': {'created': [], 'updated': [], 'deleted': []},
+            'reviews': {'created': [], 'updated': [], 'deleted': []},
+            'comments': {'created': [], 'updated': [], 'deleted': []},
+        }, (
+            f'Проверьте, что `{self.url}` без новых изменений возвращает '
+            'пустые списки и тот же токен.'
+        )
+
+    def test_02_incremental_sync(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        since = self.get_changes(client)['next']
+        review = create_single_review(
+            user_client, titles[0]['id'], 'Хорошо', 8
+        ).json()
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+
+        data = self.get_changes(client, since=since)
+        assert data['titles']['updated'] == [titles[0]['id']], (
+            f'Проверьте, что `{self.url}` возвращает произведение, '
+            'рейтинг которого изменился из-за нового отзыва.'
+        )
+        assert data['titles']['deleted'] == [titles[1]['id']], (
+            f'Проверьте, что `{self.url}` возвращает id удаленных '
+            'произведений.'
+        )
+        assert data['reviews']['created'] == [review['id']]
+
+        since = data['next']
+        user_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{review["id"]}/',
+            data={'text': 'Отлично'}
+        )
+        data = self.get_changes(client, since=since)
+        assert data['reviews']['updated'] == [review['id']]
+        assert data['titles']['updated'] == [], (
+            f'Проверьте, что `{self.url}` не возвращает произведение, '
+            'если у отзыва изменился только текст.'
+        )
+
+    def test_03_limit(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+
+        data = self.get_changes(client, limit=1)
+        assert data['has_more'] is True, (
+            f'Проверьте, что `{self.url}` сообщает об оставшихся '
+            'изменениях.'
+        )
+        assert data['titles']['created'] == [titles[0]['id']]
+        data = self.get_changes(client, since=data['next'], limit=1)
+        assert data['titles']['created'] == [titles[1]['id']]
+
+        response = client.get(self.url, {'since': -1})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что GET-запрос к `{self.url}` с некорректным '
+            'токеном возвращает ответ со статусом 400.'
+        )
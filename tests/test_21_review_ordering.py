@@ -0,0 +1,98 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21ReviewOrdering:
+
+    def create_reviews(self, admin_client, user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        for client, text, score in (
+            (user_client, 'Хорошо', 7),
+            (moderator_client, 'Плохо', 2),
+            (admin_client, 'Отлично', 10),
+        ):
+            create_single_review(client, title_id, text, score)
+        return f'/api/v1/titles/{title_id}/reviews/'
+
+    def get_texts(self, client, url, params):
+        response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` с параметрами {params} '
+            'возвращает ответ со статусом 200.'
+        )
+        return [review['text'] for review in response.json()['results']]
+
+    def test_01_ordering(self, client, admin_client, user_client,
+                         moderator_client):
+        url = self.create_reviews(admin_client, user_client, moderator_client)
+
+        assert self.get_texts(client, url, {}) == [
+            'Отлично', 'Плохо', 'Хорошо'
+        ], (
+            f'Проверьте, что `{url}` по умолчанию выводит отзывы '
+            'от новых к старым.'
+        )
+        for ordering, expected in (
+            ('-score', ['Отлично', 'Хорошо', 'Плохо']),
+            ('score', ['Плохо', 'Хорошо', 'Отлично']),
+            ('pub_date', ['Хорошо', 'Плохо', 'Отлично']),
+            ('-pub_date', ['Отлично', 'Плохо', 'Хорошо']),
+        ):
+            assert self.get_texts(
+                client, url, {'ordering': ordering}
+            ) == expected, (
+                f'Проверьте, что `{url}` поддерживает сортировку '
+                f'ordering={ordering}.'
+            )
+
+    def test_02_filters(self, client, admin_client, user_client,
+                        moderator_client):
+        url = self.create_reviews(admin_client, user_client, moderator_client)
+
+        assert self.get_texts(
+            client, url, {'score__gte': 5, 'ordering': '-score'}
+        ) == ['Отлично', 'Хорошо'], (
+            f'Проверьте, что `{url}` поддерживает фильтр score__gte.'
+        )
+        assert self.get_texts(client, url, {'score__lte': 7}) == [
+            'Плохо', 'Хорошо'
+        ], (
+            f'Проверьте, что `{url}` поддерживает фильтр score__lte.'
+        )
+        assert self.get_texts(client, url, {'author': 'TestModerator'}) == [
+            'Плохо'
+        ], (
+            f'Проверьте, что `{url}` поддерживает фильтр по username автора.'
+        )
+
+    def test_03_cursor_follows_ordering(self, client, admin_client,
+                                        user_client, moderator_client):
+        url = self.create_reviews(admin_client, user_client, moderator_client)
+        with CaptureQueriesContext(connection) as context:
+            texts = self.get_texts(
+                client, url, {'ordering': '-score', 'cursor': ''}
+            )
+        assert texts == ['Отлично', 'Хорошо', 'Плохо'], (
+            f'Проверьте, что постраничный вывод по курсору `{url}` '
+            'учитывает параметр ordering.'
+        )
+        plan_sql = context.captured_queries[0]['sql']
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {plan_sql}')
+            plan = [row[3] for row in cursor.fetchall()]
+        assert any('review_title_score_idx' in step for step in plan), (
+            f'Проверьте, что сортировка отзывов по оценке использует '
+            f'индекс. План запроса: {plan}'
+        )
+        assert not any('TEMP B-TREE' in step for step in plan), (
+            f'Проверьте, что сортировка отзывов по оценке не требует '
+            f'отдельной сортировки. План запроса: {plan}'
+        )
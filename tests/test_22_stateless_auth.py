@@ -0,0 +1,114 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.authentication import UserClaimsAccessToken
+
+
+def get_client(user):
+    client = APIClient()
+    token = UserClaimsAccessToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22StatelessAuth:
+
+    def test_01_no_user_query(self, admin):
+        client = get_client(admin)
+        url = '/api/v1/categories/'
+        data = {'name': 'Фильм', 'slug': 'films'}
+        client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что администратор с токеном, содержащим роль, '
+            f'может отправить POST-запрос к `{url}`.'
+        )
+        user_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "reviews_user"' in query['sql']
+        ]
+        assert not user_queries, (
+            'Проверьте, что аутентификация по токену с ролью пользователя '
+            f'не запрашивает пользователя из базы данных: {user_queries}'
+        )
+
+    def test_02_role_change_revokes_token(self, admin_client, user):
+        client = get_client(user)
+        url = '/api/v1/users/'
+        assert client.get(url).status_code == HTTPStatus.FORBIDDEN
+
+        response = admin_client.patch(
+            f'{url}{user.username}/', data={'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что после смены роли пользователя '
+            'ранее выданные ему токены перестают действовать.'
+        )
+        user.refresh_from_db()
+        assert get_client(user).get(url).status_code == HTTPStatus.OK, (
+            'Проверьте, что новый токен учитывает новую роль пользователя.'
+        )
+
+    def test_03_me_and_deleted_user(self, admin_client, user):
+        client = get_client(user)
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['email'] == user.email, (
+            'Проверьте, что `/api/v1/users/me/` возвращает полные данные '
+            'пользователя.'
+        )
+
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токен удаленного пользователя не действует.'
+        )
+
+    def test_04_model_changes_revoke_token(self, user, moderator):
+        url = '/api/v1/users/me/'
+        client = get_client(user)
+        assert client.get(url).status_code == HTTPStatus.OK
+        user.is_active = False
+        user.save()
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что после деактивации пользователя '
+            'ранее выданные ему токены перестают действовать.'
+        )
+        assert get_client(user).get(url).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Проверьте, что токен неактивного пользователя не действует.'
+
+        client = get_client(moderator)
+        moderator.role = 'user'
+        moderator.save()
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что изменение роли вне API '
+            'отзывает токены пользователя.'
+        )
+        client = get_client(moderator)
+        moderator.bio = 'Новая биография'
+        moderator.save()
+        assert client.get(url).status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение полей, которых нет в токене, '
+            'не отзывает токены пользователя.'
+        )
+
+    def test_05_username_change_revokes_token(self, user):
+        url = '/api/v1/users/me/'
+        client = get_client(user)
+        response = client.patch(url, data={'username': 'renamed'})
+        assert response.status_code == HTTPStatus.OK
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что после смены имени пользователя токен '
+            'с прежним именем перестает действовать.'
+        )
+        user.refresh_from_db()
+        response = get_client(user).get(url)
+        assert response.json()['username'] == 'renamed'
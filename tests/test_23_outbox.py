@@ -0,0 +1,137 @@
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.utils import timezone
+
+from reviews.models import OutboxEmail
+from reviews.outbox import claim_batch, queue_emails, send_outbox
+
+
+class FlakyBackend(EmailBackend):
+    """Почтовый бэкенд, который не может доставить письма на fail_for."""
+
+    def __init__(self, fail_for=(), error=None, **kwargs):
+        super().__init__(**kwargs)
+        self.fail_for = set(fail_for)
+        self.error = error or ConnectionError('Сервер недоступен')
+        self.opened = 0
+
+    def open(self):
+        self.opened += 1
+        return super().open()
+
+    def send_messages(self, messages):
+        for message in messages:
+            if self.fail_for & set(message.to):
+                raise self.error
+        return super().send_messages(messages)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23Outbox:
+
+    def test_01_signup_queues_email(self, client):
+        data = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+        response = client.post('/api/v1/auth/signup/', data=data)
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что при регистрации письмо не отправляется '
+            'в рамках запроса.'
+        )
+        assert OutboxEmail.objects.filter(recipient=data['email']).exists(), (
+            'Проверьте, что при регистрации письмо ставится в очередь.'
+        )
+
+        assert send_outbox() == (1, 0)
+        assert mail.outbox[0].to == [data['email']]
+        assert not OutboxEmail.objects.exists(), (
+            'Проверьте, что отправленные письма удаляются из очереди.'
+        )
+
+    def test_02_batches_over_one_connection(self):
+        recipients = [f'user{number}@yamdb.fake' for number in range(5)]
+        queue_emails(
+            (recipient, 'Тема', 'Текст') for recipient in recipients
+        )
+        connection = FlakyBackend()
+
+        assert send_outbox(batch_size=2, connection=connection) == (5, 0)
+        assert connection.opened == 1, (
+            'Проверьте, что все пачки писем отправляются '
+            'через одно соединение.'
+        )
+        assert sorted(message.to[0] for message in mail.outbox) == recipients
+
+    def test_03_retry_with_backoff(self, settings):
+        settings.OUTBOX_MAX_ATTEMPTS = 2
+        queue_emails([
+            ('ok@yamdb.fake', 'Тема', 'Текст'),
+            ('fail@yamdb.fake', 'Тема', 'Текст'),
+        ])
+        connection = FlakyBackend(fail_for=['fail@yamdb.fake'])
+
+        assert send_outbox(connection=connection) == (1, 1)
+        email = OutboxEmail.objects.get()
+        assert email.attempts == 1
+        assert email.next_attempt > timezone.now(), (
+            'Проверьте, что для неотправленного письма назначается '
+            'повторная попытка с задержкой.'
+        )
+        assert send_outbox(connection=connection) == (0, 0), (
+            'Проверьте, что письмо не отправляется повторно до окончания '
+            'задержки.'
+        )
+
+        OutboxEmail.objects.update(next_attempt=timezone.now())
+        assert send_outbox(connection=connection) == (0, 1)
+        email.refresh_from_db()
+        assert email.next_attempt is None, (
+            'Проверьте, что после исчерпания попыток письмо '
+            'больше не отправляется.'
+        )
+        assert 'Сервер недоступен' in email.last_error
+
+    def test_04_unexpected_error_does_not_abort_batch(self):
+        recipients = ['first@yamdb.fake', 'bad@yamdb.fake', 'last@yamdb.fake']
+        queue_emails(
+            (recipient, 'Тема', 'Текст') for recipient in recipients
+        )
+        connection = FlakyBackend(
+            fail_for=['bad@yamdb.fake'], error=ValueError('Неверный адрес')
+        )
+
+        assert send_outbox(connection=connection) == (2, 1), (
+            'Проверьте, что ошибка отправки одного письма не прерывает '
+            'отправку остальных.'
+        )
+        email = OutboxEmail.objects.get()
+        assert email.recipient == 'bad@yamdb.fake'
+        assert 'Неверный адрес' in email.last_error
+
+        OutboxEmail.objects.update(next_attempt=timezone.now())
+        send_outbox(connection=connection)
+        assert len(mail.outbox) == 2, (
+            'Проверьте, что доставленные письма не отправляются повторно.'
+        )
+
+    def test_05_empty_queue_and_claims(self):
+        connection = FlakyBackend()
+        assert send_outbox(connection=connection) == (0, 0)
+        assert connection.opened == 0, (
+            'Проверьте, что при пустой очереди соединение с почтовым '
+            'сервером не открывается.'
+        )
+
+        queue_emails([('claimed@yamdb.fake', 'Тема', 'Текст')])
+        claim_batch(1)
+        assert send_outbox(connection=connection) == (0, 0), (
+            'Проверьте, что письма, которые забрал другой процесс, '
+            'не отправляются повторно.'
+        )
+        OutboxEmail.objects.update(next_attempt=timezone.now())
+        assert send_outbox(connection=connection) == (1, 0), (
+            'Проверьте, что письма процесса, не завершившего отправку, '
+            'возвращаются в очередь.'
+        )
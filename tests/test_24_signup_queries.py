@@ -0,0 +1,45 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24SignupQueries:
+
+    url = '/api/v1/auth/signup/'
+
+    def signup(self, client, data, expected_status=HTTPStatus.OK):
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.url, data=data)
+        assert response.status_code == expected_status, (
+            f'Проверьте, что POST-запрос к `{self.url}` с данными {data} '
+            f'возвращает ответ со статусом {expected_status}.'
+        )
+        return [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+        ]
+
+    def test_01_single_user_lookup(self, client, user):
+        data = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+        # Регистрация и повторный запрос кода подтверждения.
+        for _ in range(2):
+            selects = self.signup(client, data)
+            assert len(selects) == 1, (
+                f'Проверьте, что POST-запрос к `{self.url}` проверяет email '
+                f'и имя пользователя одним запросом: {selects}'
+            )
+
+        for data in (
+            {'email': user.email, 'username': 'other_username'},
+            {'email': 'other@yamdb.fake', 'username': user.username},
+            {'email': user.email, 'username': 'valid_username'},
+        ):
+            selects = self.signup(client, data, HTTPStatus.BAD_REQUEST)
+            assert len(selects) == 1, (
+                f'Проверьте, что POST-запрос к `{self.url}` с занятыми '
+                'email или именем пользователя выполняет один запрос: '
+                f'{selects}'
+            )
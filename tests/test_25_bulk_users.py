@@ -0,0 +1,162 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api import provisioning
+from reviews.models import OutboxEmail
+
+
+def make_users(prefix, count):
+    return [
+        {
+            'username': f'{prefix}{number}',
+            'email': f'{prefix}{number}@yamdb.fake',
+            'role': 'moderator',
+        }
+        for number in range(count)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25BulkUsers:
+
+    url = '/api/v1/users/bulk/'
+
+    def post(self, client, data, **kwargs):
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(
+                self.url, data=data, content_type='application/json',
+                **kwargs
+            )
+        selects = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+        ]
+        return response, selects
+
+    def test_01_bulk_create_with_row_errors(self, admin_client, admin,
+                                            django_user_model):
+        rows = make_users('partner', 2) + [
+            {'username': 'broken', 'email': 'invalid_email'},
+            {'username': 'partner0', 'email': 'other@yamdb.fake'},
+            {'username': admin.username, 'email': 'admin2@yamdb.fake'},
+        ]
+        response, _ = self.post(admin_client, json.dumps(rows))
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос администратора к `{self.url}` '
+            'возвращает ответ со статусом 201.'
+        )
+        data = response.json()
+        assert data['created'] == ['partner0', 'partner1']
+        assert [error['row'] for error in data['errors']] == [3, 4, 5], (
+            f'Проверьте, что `{self.url}` возвращает ошибки по номерам строк.'
+        )
+        assert 'email' in data['errors'][0]['errors']
+        assert 'username' in data['errors'][1]['errors']
+        assert 'username' in data['errors'][2]['errors']
+        assert django_user_model.objects.filter(
+            username__startswith='partner', role='moderator'
+        ).count() == 2
+        assert sorted(
+            OutboxEmail.objects.values_list('recipient', flat=True)
+        ) == ['partner0@yamdb.fake', 'partner1@yamdb.fake'], (
+            'Проверьте, что созданным пользователям ставятся в очередь '
+            'письма с кодом подтверждения.'
+        )
+
+    def test_02_queries_do_not_grow_with_rows(self, admin_client):
+        # Фильтр отозванных токенов загружается при первом запросе.
+        admin_client.get('/api/v1/users/')
+        _, small_selects = self.post(
+            admin_client, json.dumps(make_users('small', 2))
+        )
+        _, large_selects = self.post(
+            admin_client, json.dumps(make_users('large', 50))
+        )
+        assert len(large_selects) == len(small_selects), (
+            f'Проверьте, что `{self.url}` проверяет уникальность '
+            'пользователей одним запросом для всего набора: '
+            f'{large_selects}'
+        )
+
+    def test_03_csv_and_permissions(self, admin_client, user_client,
+                                    django_user_model):
+        csv = (
+            'username,email,role,bio\n'
+            'csv_user,csv_user@yamdb.fake,user,\n'
+        )
+        response = admin_client.post(
+            self.url, data=csv, content_type='text/csv'
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что `{self.url}` принимает пользователей в CSV.'
+        )
+        assert django_user_model.objects.filter(username='csv_user').exists()
+
+        response, _ = self.post(
+            user_client, json.dumps(make_users('user', 1))
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что `{self.url}` доступен только администратору.'
+        )
+        response, _ = self.post(admin_client, json.dumps({}))
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_import_command(self, tmp_path, django_user_model):
+        path = tmp_path / 'users.json'
+        path.write_text(json.dumps(make_users('file', 3)), encoding='utf-8')
+        call_command('import_users', str(path), chunk_size=2)
+        assert django_user_model.objects.filter(
+            username__startswith='file'
+        ).count() == 3, (
+            'Проверьте, что команда import_users создает пользователей '
+            'пачками.'
+        )
+        assert OutboxEmail.objects.count() == 3
+
+    def test_05_concurrent_conflict(self, monkeypatch, admin_client,
+                                    django_user_model):
+        find_taken = provisioning.find_taken
+
+        def find_taken_then_signup(rows):
+            # Имя занимает параллельный запрос между проверкой и вставкой.
+            errors = find_taken(rows)
+            monkeypatch.setattr(provisioning, 'find_taken', find_taken)
+            django_user_model.objects.create(
+                username='partner1', email='signup@yamdb.fake'
+            )
+            return errors
+
+        monkeypatch.setattr(
+            provisioning, 'find_taken', find_taken_then_signup
+        )
+        response, _ = self.post(
+            admin_client, json.dumps(make_users('partner', 3))
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что `{self.url}` обрабатывает пользователей, '
+            'созданных параллельно с запросом.'
+        )
+        data = response.json()
+        assert data['created'] == ['partner0', 'partner2']
+        assert [error['row'] for error in data['errors']] == [2]
+        assert 'username' in data['errors'][0]['errors']
+        assert OutboxEmail.objects.count() == 2
+
+    def test_06_bulk_username_reserved(self, client, admin_client):
+        data = {'username': 'bulk', 'email': 'bulk@yamdb.fake'}
+        for api_client, url in (
+            (admin_client, '/api/v1/users/'),
+            (client, '/api/v1/auth/signup/'),
+        ):
+            response = api_client.post(url, data=data)
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что POST-запрос к `{url}` не позволяет занять '
+                f'имя `bulk`: оно совпадает с адресом `{self.url}`.'
+            )
+        response, _ = self.post(admin_client, json.dumps([data]))
+        assert 'username' in response.json()['errors'][0]['errors']
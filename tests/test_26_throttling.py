@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.throttling import SimpleRateThrottle
+
+from api.throttling import LocalThrottleStore, SQLiteThrottleStore
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26Throttling:
+
+    def test_01_signup_retry_after(self, client):
+        url = '/api/v1/auth/signup/'
+        data = {'email': 'invalid_email', 'username': 'valid_username'}
+        rate, _ = SimpleRateThrottle.THROTTLE_RATES['signup'].split('/')
+        for _ in range(int(rate)):
+            response = client.post(url, data=data)
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = client.post(url, data=data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что частота POST-запросов к `{url}` ограничена.'
+        )
+        assert int(response['Retry-After']) > 0, (
+            'Проверьте, что ответ со статусом 429 содержит заголовок '
+            '`Retry-After`.'
+        )
+
+    def test_02_reads_and_writes_scopes(self, monkeypatch, client,
+                                        admin_client):
+        monkeypatch.setitem(SimpleRateThrottle.THROTTLE_RATES, 'reads', '2/h')
+        monkeypatch.setitem(SimpleRateThrottle.THROTTLE_RATES, 'writes', '1/h')
+        url = '/api/v1/categories/'
+        for _ in range(2):
+            assert client.get(url).status_code == HTTPStatus.OK
+        assert client.get(url).status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что частота GET-запросов к `{url}` ограничена.'
+        )
+        assert admin_client.get(url).status_code == HTTPStatus.OK, (
+            'Проверьте, что ограничения считаются отдельно '
+            'для каждого пользователя.'
+        )
+        data = {'name': 'Фильм', 'slug': 'films'}
+        assert admin_client.post(url, data=data).status_code == (
+            HTTPStatus.CREATED
+        )
+        assert admin_client.post(url, data=data).status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        ), (
+            'Проверьте, что запросы на изменение ограничиваются отдельно '
+            'от запросов на чтение.'
+        )
+
+
+def check_token_bucket(store, other_store):
+    assert store.take('key', 2, 60) == 0
+    assert other_store.take('key', 2, 60) == 0
+    wait = store.take('key', 2, 60)
+    assert 0 < wait <= 30, (
+        'Проверьте, что при пустой корзине хранилище возвращает время '
+        'до появления следующего токена.'
+    )
+    assert store.take('other', 2, 60) == 0
+    store.clear()
+    assert other_store.take('key', 2, 60) == 0
+
+
+def test_local_throttle_store():
+    store = LocalThrottleStore()
+    check_token_bucket(store, store)
+
+
+def test_sqlite_throttle_store_is_shared(tmp_path):
+    path = tmp_path / 'throttle.sqlite3'
+    check_token_bucket(SQLiteThrottleStore(path), SQLiteThrottleStore(path))
@@ -0,0 +1,91 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27TokenRefresh:
+
+    url_token = '/api/v1/auth/token/'
+    url_refresh = '/api/v1/auth/token/refresh/'
+
+    def get_tokens(self, client, user):
+        response = client.post(self.url_token, data={
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        })
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert {'token', 'refresh'} <= set(data), (
+            f'Проверьте, что `{self.url_token}` возвращает токен доступа '
+            'в поле `token` и токен обновления в поле `refresh`.'
+        )
+        return data
+
+    def test_01_refresh_rotates_tokens(self, client, user):
+        tokens = self.get_tokens(client, user)
+        response = client.post(
+            self.url_refresh, data={'refresh': tokens['refresh']}
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что POST-запрос к `{self.url_refresh}` с токеном '
+            'обновления возвращает ответ со статусом 200.'
+        )
+        refreshed = response.json()
+        assert refreshed['refresh'] != tokens['refresh'], (
+            f'Проверьте, что `{self.url_refresh}` выдает новый токен '
+            'обновления.'
+        )
+        response = client.post(
+            self.url_refresh, data={'refresh': tokens['refresh']}
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            f'Проверьте, что `{self.url_refresh}` не принимает токен '
+            'обновления, который уже был заменен.'
+        )
+        response = client.post(
+            self.url_refresh, data={'refresh': refreshed['refresh']}
+        )
+        assert response.status_code == HTTPStatus.OK
+
+        api_client = APIClient()
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {refreshed["token"]}'
+        )
+        response = api_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['username'] == user.username
+
+    def test_02_invalid_refresh(self, client, admin_client, user):
+        tokens = self.get_tokens(client, user)
+        for refresh in ('invalid', tokens['token']):
+            response = client.post(self.url_refresh, data={'refresh': refresh})
+            assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+                f'Проверьте, что `{self.url_refresh}` не принимает '
+                'некорректный токен обновления.'
+            )
+
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'moderator'}
+        )
+        response = client.post(
+            self.url_refresh, data={'refresh': tokens['refresh']}
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что после смены роли пользователя его токен '
+            'обновления перестает действовать.'
+        )
+
+    def test_03_inactive_user(self, client, user):
+        tokens = self.get_tokens(client, user)
+        user.is_active = False
+        user.save()
+        response = client.post(
+            self.url_refresh, data={'refresh': tokens['refresh']}
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            f'Проверьте, что `{self.url_refresh}` не выдает токены '
+            'неактивному пользователю.'
+        )
@@ -0,0 +1,126 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from api.authentication import UserClaimsAccessToken
+from api.revocation import BloomFilter, revocation_list
+from reviews.models import TokenRevocation
+
+
+def get_client(user):
+    client = APIClient()
+    token = UserClaimsAccessToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+def test_bloom_filter():
+    bloom_filter = BloomFilter(1000)
+    for item in range(1000):
+        bloom_filter.add(item)
+    assert all(item in bloom_filter for item in range(1000)), (
+        'Проверьте, что фильтр Блума находит все добавленные элементы.'
+    )
+    false_positives = sum(
+        item in bloom_filter for item in range(1000, 11000)
+    )
+    assert false_positives < 300, (
+        'Проверьте, что доля ложных срабатываний фильтра Блума невелика: '
+        f'{false_positives} из 10000.'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28TokenRevocation:
+
+    url = '/api/v1/users/me/'
+
+    def test_01_no_query_for_valid_tokens(self, user, admin):
+        revocation_list.revoke(admin.pk)
+        client = get_client(user)
+        client.get(self.url)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.url)
+        assert response.status_code == HTTPStatus.OK
+        revocation_queries = [
+            query['sql'] for query in context.captured_queries
+            if TokenRevocation._meta.db_table in query['sql']
+        ]
+        assert not revocation_queries, (
+            'Проверьте, что для неотозванных токенов список отзыва '
+            f'не запрашивается из базы данных: {revocation_queries}'
+        )
+
+    def test_02_revoked_token_rejected(self, user, user_client):
+        client = get_client(user)
+        assert client.get(self.url).status_code == HTTPStatus.OK
+        revocation_list.revoke(user.pk)
+        for api_client in (client, user_client):
+            response = api_client.get(self.url)
+            assert response.status_code == HTTPStatus.UNAUTHORIZED
+            assert response.json()['code'] == 'token_revoked', (
+                'Проверьте, что отозванный токен не действует.'
+            )
+
+    def test_03_destroy_revokes_tokens(self, admin_client, user):
+        client = get_client(user)
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert TokenRevocation.objects.filter(user_id=user.pk).exists(), (
+            'Проверьте, что при удалении пользователя его токены '
+            'заносятся в список отзыва.'
+        )
+        revocation_list.reset()
+        response = client.get(self.url)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        assert response.json()['code'] == 'token_revoked', (
+            'Проверьте, что после перестроения фильтра отзыв токенов '
+            'удаленного пользователя продолжает действовать.'
+        )
+
+    def test_04_deactivation_revokes_tokens(self, user, moderator):
+        user.is_active = False
+        user.save()
+        assert TokenRevocation.objects.filter(user_id=user.pk).exists(), (
+            'Проверьте, что при деактивации пользователя его токены '
+            'заносятся в список отзыва.'
+        )
+        moderator.bio = 'Новая биография'
+        moderator.save()
+        assert not TokenRevocation.objects.filter(
+            user_id=moderator.pk
+        ).exists()
+
+    def test_05_prune_command(self, user, admin):
+        revocation_list.revoke(user.pk)
+        revocation_list.revoke(admin.pk)
+        TokenRevocation.objects.filter(user_id=admin.pk).update(
+            revoked_at=(
+                timezone.now() - jwt_settings.REFRESH_TOKEN_LIFETIME
+                - timedelta(days=1)
+            )
+        )
+        revocation_list.reset()
+        with CaptureQueriesContext(connection) as context:
+            revocation_list.get_filter()
+        assert all(
+            query['sql'].startswith('SELECT')
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что перестроение фильтра отозванных токенов '
+            'не изменяет таблицу.'
+        )
+        call_command('prune_token_revocations')
+        assert list(
+            TokenRevocation.objects.values_list('user_id', flat=True)
+        ) == [user.pk], (
+            'Проверьте, что команда prune_token_revocations удаляет '
+            'только устаревшие записи.'
+        )